@@ -0,0 +1,118 @@
+"""Model and background loader for the merge tab's chunk list.
+
+A QListWidget holds one item object per row and is filled on the GUI thread, which
+freezes the window for chunk sets with tens of thousands of parts. Here the paths live
+in a plain list behind a QAbstractListModel: the view only asks for the rows it draws,
+and rows are exposed to it in batches as it scrolls (canFetchMore/fetchMore). Scanning
+a directory and sorting the paths happen on a ChunkLoader thread, which hands the
+result to the model in batches so the list fills in while the window stays responsive.
+"""
+import os
+import threading
+from typing import List
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt, QThread, pyqtSignal
+
+from chunkify import scanner
+
+FETCH_BATCH = 1000  # rows handed to the view per fetchMore
+LOAD_BATCH = 5000  # paths sent from the loader thread per signal
+
+def chunk_sort_key(path: str) -> tuple:
+    """Orders chunk paths by directory, prefix and part number; other files sort by name."""
+    directory, name = os.path.split(path)
+    part = scanner.split_part_name(name)
+    if part:
+        return directory, part[0], part[1]
+    return directory, name, -1
+
+class ChunkListModel(QAbstractListModel):
+    """Read-only list of chunk paths. All paths are held, but rows are revealed to views lazily."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = []
+        self._shown = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._shown
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._shown:
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._paths[index.row()]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._shown < len(self._paths)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH, len(self._paths) - self._shown)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._shown, self._shown + count - 1)
+        self._shown += count
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._paths = []
+        self._shown = 0
+        self.endResetModel()
+
+    def append_paths(self, paths: List[str]) -> None:
+        """Adds paths at the end; the first screenful becomes visible straight away."""
+        self._paths.extend(paths)
+        if self._shown < FETCH_BATCH:
+            self.fetchMore()
+
+    def paths(self) -> List[str]:
+        """Every path in the model, including rows not yet revealed to a view."""
+        return list(self._paths)
+
+    def count(self) -> int:
+        return len(self._paths)
+
+class ChunkLoader(QThread):
+    """Collects and sorts chunk paths off the GUI thread, then emits them in batches.
+    Give it either the files picked in a dialog or a directory to scan for chunk files.
+    A merge takes one chunk group, so a directory holding several emits groups_found
+    (prefix -> paths) instead, for the caller to pick one and load its paths."""
+    batch_loaded = pyqtSignal(list)
+    groups_found = pyqtSignal(dict)
+    loading_finished = pyqtSignal(int)
+    loading_failed = pyqtSignal(str)
+
+    def __init__(self, paths: List[str] = None, directory: str = None):
+        super().__init__()
+        self.paths = paths or []
+        self.directory = directory
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            paths = list(self.paths)
+            if self.directory:
+                groups = scanner.group_chunks(scanner.iter_listings(self.directory, with_sizes=False))
+                if self._cancelled.is_set():
+                    return
+                if len(groups) > 1:
+                    self.groups_found.emit({prefix: [os.path.join(self.directory, chunk) for chunk in chunks]
+                                            for prefix, chunks in groups.items()})
+                    return
+                for chunks in groups.values():
+                    paths.extend(os.path.join(self.directory, chunk) for chunk in chunks)
+            paths.sort(key=chunk_sort_key)
+            for start in range(0, len(paths), LOAD_BATCH):
+                if self._cancelled.is_set():
+                    return
+                self.batch_loaded.emit(paths[start:start + LOAD_BATCH])
+            self.loading_finished.emit(len(paths))
+        except OSError as e:
+            self.loading_failed.emit(str(e))
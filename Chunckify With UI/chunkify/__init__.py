@@ -0,0 +1,60 @@
+"""The chunking engine behind UAssetChunkify, as a library without a GUI or prompts.
+
+    import chunkify
+    chunkify.split_file("Hero.uasset", 25 * 1024 * 1024, workers=4)
+    chunkify.merge_files("Hero.uasset", ["Hero_part000.uasset", "Hero_part001.uasset"])
+
+Importing the package only defines the table below; each name is loaded from its
+module the first time it is used, so a script that only splits never loads the pack,
+stream or chunk store code. The modules import their heavy or optional dependencies
+(hashlib, lzma, zstandard, numpy, concurrent.futures, cProfile) inside the functions
+that need them, and nothing in the package imports PyQt5: ui.py and main.py are the
+GUI, cli.py and UAssetChunkify.py the command-line front ends. The package prints
+nothing itself: status lines and warnings go to the "chunkify" loggers, and the front
+ends decide where they are shown.
+"""
+import importlib
+
+# Public name -> (module, attribute); FileProcessor's methods are offered as plain functions
+_EXPORTS = {
+    "FileProcessor": ("core", "FileProcessor"),
+    "OperationCancelled": ("core", "OperationCancelled"),
+    "CHUNK_SIZE": ("core", "CHUNK_SIZE"),
+    "DEFAULT_WORKERS": ("core", "DEFAULT_WORKERS"),
+    "DURABILITY_LEVELS": ("core", "DURABILITY_LEVELS"),
+    "MANIFEST_SUFFIX": ("core", "MANIFEST_SUFFIX"),
+    "split_file": ("core", "FileProcessor.split_file"),
+    "merge_files": ("core", "FileProcessor.merge_files"),
+    "verify_chunks": ("core", "FileProcessor.verify_chunks"),
+    "find_large_files": ("core", "FileProcessor.find_large_files"),
+    "find_chunk_groups": ("core", "FileProcessor.find_chunk_groups"),
+    "find_manifest": ("core", "FileProcessor.find_manifest"),
+    "merge_output_path": ("core", "FileProcessor.merge_output_path"),
+    "available_codecs": ("chunk_codecs", "available_codecs"),
+    "ChunkedFile": ("chunked_file", "ChunkedFile"),
+    "ChunkStore": ("chunk_store", "ChunkStore"),
+    "split_stream": ("streaming", "split_stream"),
+    "merge_to_stream": ("streaming", "merge_to_stream"),
+    "pack_files": ("packing", "pack_files"),
+    "unpack_files": ("packing", "unpack_files"),
+    "PackReader": ("packing", "PackReader"),
+    "Job": ("scheduler", "Job"),
+    "run_jobs": ("scheduler", "run_jobs"),
+    "TransferMetrics": ("metrics", "TransferMetrics"),
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    try:
+        module_name, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = importlib.import_module(f".{module_name}", __name__)
+    for part in attribute.split("."):
+        value = getattr(value, part)
+    globals()[name] = value  # later lookups don't come back here
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
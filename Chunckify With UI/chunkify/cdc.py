@@ -0,0 +1,135 @@
+"""Content-defined chunk boundaries.
+
+Cut points are placed where a rolling hash of the last WINDOW_SIZE bytes matches a
+mask, so inserting bytes into a file only moves the boundaries next to the edit and
+every other chunk keeps its content. The hash is a windowed polynomial hash over a
+random per-byte table, which can be evaluated for a whole block at once with prefix
+sums. numpy does that when it is installed; otherwise a pure-Python loop computes the
+exact same boundaries, just far more slowly, which is why split_file and the chunk store
+check has_numpy() and use fixed-size chunks instead.
+"""
+import hashlib
+from bisect import bisect_left
+from typing import List, Tuple
+
+WINDOW_SIZE = 64  # bytes covered by the rolling hash
+SCAN_BLOCK_SIZE = 1024 * 1024  # bytes hashed per step while scanning for cut points
+
+_MASK64 = (1 << 64) - 1
+_PRIME = 0x100000001B3  # odd, so it has an inverse mod 2^64
+_PRIME_INVERSE = pow(_PRIME, -1, 1 << 64)
+_PRIME_POW_WINDOW = pow(_PRIME, WINDOW_SIZE, 1 << 64)
+
+# Random value per byte; derived from sha256 so boundaries never change between releases
+GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], 'little') for i in range(256)]
+
+_numpy_tables = None
+
+def _load_numpy():
+    """Imports numpy on first use and builds the lookup tables; returns None if it's missing."""
+    global _numpy_tables
+    if _numpy_tables is None:
+        try:
+            import numpy as np
+        except ImportError:
+            _numpy_tables = False
+        else:
+            length = SCAN_BLOCK_SIZE + WINDOW_SIZE
+            powers = np.full(length, _PRIME, dtype=np.uint64)
+            powers[0] = 1
+            inverse_powers = np.full(length, _PRIME_INVERSE, dtype=np.uint64)
+            inverse_powers[0] = 1
+            _numpy_tables = (np, np.array(GEAR, dtype=np.uint64),
+                             np.cumprod(powers, dtype=np.uint64), np.cumprod(inverse_powers, dtype=np.uint64))
+    return _numpy_tables or None
+
+def has_numpy() -> bool:
+    """Whether numpy is available to scan for boundaries; the pure-Python scan manages only a few MB/s."""
+    return _load_numpy() is not None
+
+def _masks(avg_size: int) -> Tuple[int, int]:
+    """Returns (strict, loose) masks over the top hash bits for FastCDC-style normalized chunking.
+    The strict mask is used before a chunk reaches avg_size and the loose one after it,
+    which keeps chunk sizes clustered around the average."""
+    bits = max(avg_size.bit_length() - 1, 2)
+    strict = (_MASK64 << (64 - bits - 1)) & _MASK64
+    loose = (_MASK64 << (64 - bits + 1)) & _MASK64
+    return strict, loose
+
+def _scan_python(f, strict_mask: int, loose_mask: int) -> Tuple[List[int], List[int]]:
+    strict_cuts, loose_cuts = [], []
+    h = 0
+    tail = b""
+    position = 0
+    for block in iter(lambda: f.read(SCAN_BLOCK_SIZE), b""):
+        data = tail + block
+        base = position - len(tail)
+        for j in range(len(tail), len(data)):
+            h = (h * _PRIME + GEAR[data[j]]) & _MASK64
+            if base + j >= WINDOW_SIZE:
+                h = (h - GEAR[data[j - WINDOW_SIZE]] * _PRIME_POW_WINDOW) & _MASK64
+            if not h & loose_mask:
+                loose_cuts.append(base + j + 1)
+                if not h & strict_mask:
+                    strict_cuts.append(base + j + 1)
+        tail = data[-WINDOW_SIZE:]
+        position += len(block)
+    return strict_cuts, loose_cuts
+
+def _scan_numpy(f, strict_mask: int, loose_mask: int, tables) -> Tuple[List[int], List[int]]:
+    np, gear, powers, inverse_powers = tables
+    strict_cuts, loose_cuts = [], []
+    tail = b""
+    position = 0
+    for block in iter(lambda: f.read(SCAN_BLOCK_SIZE), b""):
+        data = tail + block
+        length = len(data)
+        # h[j] = sum(GEAR[data[k]] * P^(j-k)) over the window ending at j, via prefix sums scaled by P^-k
+        sums = np.cumsum(gear[np.frombuffer(data, dtype=np.uint8)] * inverse_powers[:length], dtype=np.uint64)
+        hashes = sums.copy()
+        hashes[WINDOW_SIZE:] -= sums[:-WINDOW_SIZE]
+        hashes *= powers[:length]
+        hashes = hashes[len(tail):]
+
+        cut_base = position + 1
+        loose_hits = np.flatnonzero((hashes & np.uint64(loose_mask)) == 0)
+        strict_hits = loose_hits[(hashes[loose_hits] & np.uint64(strict_mask)) == 0]
+        loose_cuts.extend((loose_hits + cut_base).tolist())
+        strict_cuts.extend((strict_hits + cut_base).tolist())
+
+        tail = data[-(WINDOW_SIZE - 1):]
+        position += len(block)
+    return strict_cuts, loose_cuts
+
+def chunk_ranges(file_path: str, avg_size: int, min_size: int = None, max_size: int = None) -> List[Tuple[int, int]]:
+    """Returns (offset, length) of every content-defined chunk of file_path.
+    Sizes default to FastCDC's avg/4 and avg*4 bounds; the last chunk may be shorter than min_size."""
+    min_size = max(min_size or avg_size // 4, WINDOW_SIZE)
+    max_size = max(max_size or avg_size * 4, min_size)
+    strict_mask, loose_mask = _masks(avg_size)
+
+    tables = _load_numpy()
+    with open(file_path, 'rb') as f:
+        if tables:
+            strict_cuts, loose_cuts = _scan_numpy(f, strict_mask, loose_mask, tables)
+        else:
+            strict_cuts, loose_cuts = _scan_python(f, strict_mask, loose_mask)
+        file_size = f.tell()
+
+    ranges = []
+    start = 0
+    while start < file_size:
+        end = min(start + max_size, file_size)
+        cut = end
+        if file_size - start > min_size:
+            normal = min(start + avg_size, end)
+            i = bisect_left(strict_cuts, start + min_size)
+            if i < len(strict_cuts) and strict_cuts[i] < normal:
+                cut = strict_cuts[i]
+            else:
+                i = bisect_left(loose_cuts, normal)
+                if i < len(loose_cuts) and loose_cuts[i] <= end:
+                    cut = loose_cuts[i]
+        ranges.append((start, cut - start))
+        start = cut
+    return ranges
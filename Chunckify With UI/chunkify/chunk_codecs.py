@@ -0,0 +1,76 @@
+"""Per-chunk compression codecs.
+
+Each codec streams through bounded buffers in both directions, so memory use doesn't
+depend on the chunk size. zlib and lzma come from the standard library and release
+the GIL while they work, so chunks compress in parallel on the split thread pool.
+zstd is offered when the optional zstandard package is installed.
+"""
+import zlib
+from typing import Callable, Iterator, List
+
+class Codec:
+    """A named pair of a compressor factory and a streaming decompressor."""
+
+    def __init__(self, name: str, compressor: Callable, decompress: Callable[..., Iterator[bytes]]):
+        self.name = name
+        self.compressor = compressor  # returns an object with compress(data) and flush()
+        self.decompress = decompress  # decompress(file, buffer_size) yields pieces of at most buffer_size
+
+def _zlib_decompress(f, buffer_size: int) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj()
+    while not decompressor.eof:
+        data = decompressor.unconsumed_tail or f.read(buffer_size)
+        if not data:
+            raise ValueError("Compressed chunk is truncated")
+        yield decompressor.decompress(data, buffer_size)
+    yield decompressor.flush()
+
+def _lzma_decompress(f, buffer_size: int) -> Iterator[bytes]:
+    import lzma
+    decompressor = lzma.LZMADecompressor()
+    while not decompressor.eof:
+        data = b""
+        if decompressor.needs_input:
+            data = f.read(buffer_size)
+            if not data:
+                raise ValueError("Compressed chunk is truncated")
+        yield decompressor.decompress(data, buffer_size)
+
+def _zstd_decompress(f, buffer_size: int) -> Iterator[bytes]:
+    import zstandard
+    yield from zstandard.ZstdDecompressor().read_to_iter(f, read_size=buffer_size, write_size=buffer_size)
+
+def _lzma_compressor():
+    import lzma
+    return lzma.LZMACompressor(preset=6)
+
+def _zstd_compressor():
+    import zstandard
+    return zstandard.ZstdCompressor(level=3, threads=0).compressobj()
+
+CODECS = {
+    "zlib": Codec("zlib", lambda: zlib.compressobj(6), _zlib_decompress),
+    "lzma": Codec("lzma", _lzma_compressor, _lzma_decompress),
+    "zstd": Codec("zstd", _zstd_compressor, _zstd_decompress),
+}
+
+def available_codecs() -> List[str]:
+    """Returns the codec names usable here, starting with "none"."""
+    names = ["none", "zlib", "lzma"]
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        names.append("zstd")
+    return names
+
+def get_codec(name: str):
+    """Returns the Codec for name, or None for "none"/None."""
+    if not name or name == "none":
+        return None
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec: {name} (expected one of {', '.join(available_codecs())})")
+    if name not in available_codecs():
+        raise ValueError(f"The {name} codec needs the optional zstandard package")
+    return CODECS[name]
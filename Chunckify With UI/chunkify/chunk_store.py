@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import threading
+from typing import List
+
+from . import scanner
+from .core import (FileProcessor, CHUNK_SIZE, COPY_BUFFER_SIZE, HASH_ALGORITHM, check_durability, copy_range,
+                   fsync_directory, fsync_path, hash_range, preallocate, root_hash, run_tasks, temp_path,
+                   write_json_atomic)
+
+RECIPE_SUFFIX = ".recipe.json"  # written in place of _partNNN files, e.g. Hero.uasset.recipe.json
+
+logger = logging.getLogger(__name__)
+
+class ChunkStore:
+    """A directory of chunks named by their content hash, shared by many files.
+    Each stored file is described by a small recipe listing its chunk hashes in order,
+    so regions that several files have in common are only kept once."""
+
+    def __init__(self, root: str, algorithm: str = HASH_ALGORITHM):
+        self.root = root
+        self.algorithm = algorithm
+        self.bytes_written = 0
+        self.bytes_deduplicated = 0
+        self._lock = threading.Lock()
+
+    def chunk_path(self, chunk_hash: str) -> str:
+        """Returns where a chunk lives in the store; fanned out by the first two hex digits."""
+        return os.path.join(self.root, "objects", chunk_hash[:2], chunk_hash[2:])
+
+    def _put_range(self, file_path: str, offset: int, length: int, sync: bool = False) -> str:
+        """Adds one byte range of file_path to the store unless an identical chunk is already there.
+        With sync, a new chunk is fsynced before it appears under its name."""
+        with open(file_path, 'rb', buffering=0) as f:
+            chunk_hash = hash_range(f.fileno(), offset, length, algorithm=self.algorithm)
+            chunk_path = self.chunk_path(chunk_hash)
+            if os.path.exists(chunk_path):
+                with self._lock:
+                    self.bytes_deduplicated += length
+                return chunk_hash
+
+            os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+            # Write under a private name first so a concurrent writer of the same chunk never sees a partial file
+            private_path = f"{chunk_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(private_path, 'wb', buffering=0) as chunk_file:
+                copy_range(f.fileno(), chunk_file.fileno(), offset, length)
+                if sync:
+                    os.fsync(chunk_file.fileno())
+            os.replace(private_path, chunk_path)
+
+        with self._lock:
+            self.bytes_written += length
+        return chunk_hash
+
+    def store_file(self, file_path: str, chunk_size: int = CHUNK_SIZE, delete_original: bool = False,
+                   output_dir: str = None, workers: int = 1, content_defined: bool = True,
+                   durability: str = "none") -> str:
+        """Chunks a file into the store and writes its recipe next to it (or into output_dir).
+        Content-defined boundaries are the default, since they are what lets edited
+        variants of an asset share chunks; without numpy, scanning for them is too slow
+        and fixed-size chunks are used instead, with a warning. durability works as in split_file and covers every
+        chunk the recipe refers to; delete_original implies at least "job". Returns the recipe path."""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        check_durability(durability)
+        if delete_original and durability == "none":
+            durability = "job"
+
+        logger.info("Storing file: %s", file_path)
+
+        file_dir, file_name = os.path.split(file_path)
+        output_directory = output_dir if output_dir else file_dir
+        file_size = os.path.getsize(file_path)
+
+        if content_defined:
+            from . import cdc
+            if not cdc.has_numpy():
+                logger.warning("numpy is not installed; storing %s with fixed-size chunks, "
+                               "which deduplicate less across edits", file_path)
+                content_defined = False
+        if content_defined:
+            boundaries = cdc.chunk_ranges(file_path, chunk_size)
+        else:
+            boundaries = [(offset, min(chunk_size, file_size - offset)) for offset in range(0, file_size, chunk_size)]
+
+        chunk_hashes = run_tasks(self._put_range, [(file_path, offset, length, durability == "chunk")
+                                                   for offset, length in boundaries], workers)
+        if durability != "none":
+            unique = sorted(set(chunk_hashes))
+            # Deduplicated chunks may come from a store run without durability, so they are synced too
+            if durability == "job":
+                run_tasks(fsync_path, [(self.chunk_path(chunk_hash),) for chunk_hash in unique], workers)
+            fan_out = sorted({os.path.dirname(self.chunk_path(chunk_hash)) for chunk_hash in unique})
+            for directory in fan_out + [os.path.join(self.root, "objects"), self.root]:
+                fsync_directory(directory)
+
+        recipe = {
+            "file_name": file_name,
+            "size": file_size,
+            "algorithm": self.algorithm,
+            "hash": root_hash(chunk_hashes, self.algorithm),
+            "chunks": [{"hash": chunk_hash, "size": length}
+                       for (_, length), chunk_hash in zip(boundaries, chunk_hashes)],
+        }
+        recipe_path = os.path.join(output_directory, f"{file_name}{RECIPE_SUFFIX}")
+        write_json_atomic(recipe_path, recipe, durability != "none")
+        if durability != "none":
+            fsync_directory(output_directory)
+
+        if delete_original:
+            os.remove(file_path)
+
+        return recipe_path
+
+    def restore_file(self, recipe_path: str, output_path: str = None, delete_recipe: bool = False,
+                     buffer_size: int = COPY_BUFFER_SIZE, workers: int = 1, verify: bool = True,
+                     durability: str = "none") -> str:
+        """Rebuilds a file from its recipe; by default next to the recipe under its original name.
+        With verify, every referenced chunk is hashed first and a damaged store raises ValueError.
+        The output appears under its name once complete; durability works as in merge_files,
+        and delete_recipe implies at least "job". Returns the output path."""
+        check_durability(durability)
+        if delete_recipe and durability == "none":
+            durability = "job"
+        with open(recipe_path, 'r', encoding='utf-8') as f:
+            recipe = json.load(f)
+
+        if output_path is None:
+            output_path = os.path.join(os.path.dirname(recipe_path), recipe["file_name"])
+
+        chunk_paths = [self.chunk_path(chunk["hash"]) for chunk in recipe["chunks"]]
+        missing = [path for path in chunk_paths if not os.path.isfile(path)]
+        if missing:
+            raise FileNotFoundError(f"{len(missing)} chunk(s) missing from store, e.g. {missing[0]}")
+
+        if verify:
+            unique = sorted({chunk["hash"] for chunk in recipe["chunks"]})
+            digests = run_tasks(FileProcessor._hash_file,
+                                [(self.chunk_path(chunk_hash), recipe["algorithm"]) for chunk_hash in unique], workers)
+            corrupt = [chunk_hash for chunk_hash, digest in zip(unique, digests) if digest != chunk_hash]
+            if corrupt:
+                raise ValueError(f"Chunk verification failed: {len(corrupt)} corrupt chunk(s) in store")
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+
+        partial_path = temp_path(output_path)
+        with open(partial_path, 'wb', buffering=0) as output_file:
+            preallocate(output_file.fileno(), recipe["size"])
+
+        tasks = []
+        offset = 0
+        for chunk_path, chunk in zip(chunk_paths, recipe["chunks"]):
+            tasks.append((chunk_path, partial_path, offset, chunk["size"], buffer_size, None, durability == "chunk"))
+            offset += chunk["size"]
+        run_tasks(FileProcessor._merge_chunk, tasks, workers)
+
+        if durability == "job":
+            fsync_path(partial_path)
+        os.replace(partial_path, output_path)
+        if durability != "none":
+            fsync_directory(output_dir)
+
+        if delete_recipe:
+            os.remove(recipe_path)
+
+        return output_path
+
+    @staticmethod
+    def find_recipes(directory: str, recursive: bool = False, index_path: str = None) -> List[str]:
+        """Returns the recipe files in a directory, as paths relative to it."""
+        return [path for path, _ in scanner.scan_files(directory, recursive, index_path) if path.endswith(RECIPE_SUFFIX)]
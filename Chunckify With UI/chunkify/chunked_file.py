@@ -0,0 +1,146 @@
+"""Read-only file object over a chunk set, so parts of a split file can be read without merging it.
+
+The chunk sizes are taken once into an offset index; a read finds its first chunk by
+binary search and continues into the following chunks as needed. Chunks are only
+opened when a read reaches them, so reading a header touches just the first part.
+Compressed and sparse chunks can't be read at arbitrary offsets and are rejected.
+"""
+import io
+import json
+import mmap
+import os
+from bisect import bisect_right
+from typing import List
+
+from . import scanner
+from .core import FileProcessor, read_into
+
+class ChunkedFile(io.RawIOBase):
+    """Seekable, read-only view of the file a chunk group was split from.
+    With use_mmap, each chunk is memory-mapped when first read instead of read with pread."""
+
+    def __init__(self, chunk_paths: List[str], use_mmap: bool = False):
+        super().__init__()
+        self.chunk_paths = sorted(chunk_paths, key=scanner.part_number)
+        self.use_mmap = use_mmap
+
+        manifest_path = FileProcessor.find_manifest(self.chunk_paths)
+        sizes = None
+        if manifest_path:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("codec", "none") != "none":
+                raise ValueError(f"Chunks compressed with {manifest['codec']} can't be read in place; merge them first")
+            if any(chunk.get("holes") for chunk in manifest["chunks"]):
+                raise ValueError("Sparse chunks can't be read in place; merge them first")
+            manifest_sizes = {chunk["name"]: chunk["size"] for chunk in manifest["chunks"]}
+            names = [os.path.basename(path) for path in self.chunk_paths]
+            if all(name in manifest_sizes for name in names):
+                sizes = [manifest_sizes[name] for name in names]
+        if sizes is None:
+            sizes = [os.path.getsize(path) for path in self.chunk_paths]
+
+        # starts[i] is where chunk i begins in the whole file
+        self._starts = []
+        offset = 0
+        for size in sizes:
+            self._starts.append(offset)
+            offset += size
+        self._sizes = sizes
+        self.size = offset
+        self._position = 0
+        self._files = {}
+        self._maps = {}
+
+    @classmethod
+    def from_group(cls, directory: str, chunks: List[str], use_mmap: bool = False) -> "ChunkedFile":
+        """Opens a group as returned by FileProcessor.find_chunk_groups(directory)."""
+        return cls([os.path.join(directory, chunk) for chunk in chunks], use_mmap)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def _chunk(self, index: int):
+        """Returns the open file (or mmap) of chunk index, opening it on first use."""
+        if self.use_mmap:
+            chunk_map = self._maps.get(index)
+            if chunk_map is None and self._sizes[index]:
+                with open(self.chunk_paths[index], 'rb') as f:
+                    chunk_map = self._maps[index] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return chunk_map
+        chunk_file = self._files.get(index)
+        if chunk_file is None:
+            chunk_file = self._files[index] = open(self.chunk_paths[index], 'rb', buffering=0)
+        return chunk_file
+
+    def _read_at(self, view: memoryview, offset: int) -> int:
+        """Fills view with the bytes at offset of the whole file; returns how many were available."""
+        done = 0
+        index = bisect_right(self._starts, offset) - 1
+        while done < len(view) and 0 <= index < len(self._sizes) and offset + done < self.size:
+            chunk_offset = offset + done - self._starts[index]
+            length = min(len(view) - done, self._sizes[index] - chunk_offset)
+            if length > 0:
+                chunk = self._chunk(index)
+                if self.use_mmap:
+                    view[done:done + length] = chunk[chunk_offset:chunk_offset + length]
+                    n = length
+                else:
+                    n = read_into(chunk.fileno(), view[done:done + length], chunk_offset)
+                    if n < length:
+                        raise ValueError(f"{os.path.basename(self.chunk_paths[index])} is shorter than expected")
+                done += n
+            index += 1
+        return done
+
+    def readinto(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        with memoryview(buffer) as view:
+            n = self._read_at(view.cast('B'), self._position)
+        self._position += n
+        return n
+
+    def readall(self) -> bytes:
+        return self.read(max(self.size - self._position, 0))
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        """Returns up to length bytes starting at offset without moving the file position."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        buffer = bytearray(max(min(length, self.size - offset), 0))
+        n = self._read_at(memoryview(buffer), offset)
+        del buffer[n:]
+        return bytes(buffer)
+
+    def close(self) -> None:
+        if not self.closed:
+            for chunk_map in self._maps.values():
+                chunk_map.close()
+            for chunk_file in self._files.values():
+                chunk_file.close()
+            self._maps.clear()
+            self._files.clear()
+        super().close()
@@ -0,0 +1,1038 @@
+import contextlib
+import errno
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, List, Dict, Optional, Tuple
+
+from . import chunk_codecs
+from . import scanner
+from . import tracing
+from .metrics import TransferMetrics
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 25 * 1024 * 1024  # 25MB default chunk size
+COPY_BUFFER_SIZE = 1024 * 1024  # 1MB buffer for the user-space copy fallback
+PIPELINE_DEPTH = 3  # buffers per pipelined copy: one being read, one being written, one spare
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)  # suggested worker count for the front ends
+HASH_ALGORITHM = "sha256"  # hashlib algorithm used for chunk manifests
+MANIFEST_SUFFIX = ".manifest.json"  # sidecar written next to the chunks, e.g. Hero.uasset.manifest.json
+JOURNAL_SUFFIX = ".journal"  # checkpoint of completed chunks while a split or merge is running
+SPARSE_BLOCK = 64 * 1024  # zero runs inside data are only left out as whole, aligned blocks of this size
+# When written data is forced to disk: never, once per job before anything is deleted, or after every chunk
+DURABILITY_LEVELS = ("none", "job", "chunk")
+
+# errno values meaning "this fd pair can't use the kernel copy call", not a real I/O failure
+_UNSUPPORTED_COPY_ERRORS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.ENOTSOCK,
+    getattr(errno, "EOPNOTSUPP", errno.EINVAL), getattr(errno, "ENOTSUP", errno.EINVAL),
+}
+
+def new_digest(algorithm: str = HASH_ALGORITHM):
+    """Returns hashlib.new(algorithm); hashlib, and OpenSSL behind it, only loads once something is hashed."""
+    import hashlib
+    return hashlib.new(algorithm)
+
+def _read_at(fd: int, size: int, offset: int) -> bytes:
+    """Positional read that also works where os.pread is missing (Windows)."""
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+def copy_range(src_fd: int, dst_fd: int, offset: int, length: int, buffer_size: int = COPY_BUFFER_SIZE) -> int:
+    """Copies length bytes starting at offset in src_fd to the current position of dst_fd.
+    Data is moved inside the kernel with copy_file_range/sendfile when possible,
+    otherwise through a fixed buffer_size buffer. Returns the number of bytes copied."""
+    copied = 0
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            with tracing.span("copy_file_range", bytes=length):
+                while copied < length:
+                    n = os.copy_file_range(src_fd, dst_fd, length - copied, offset + copied)
+                    if n == 0:
+                        return copied
+                    copied += n
+            return copied
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_COPY_ERRORS:
+                raise
+
+    if hasattr(os, "sendfile"):
+        try:
+            with tracing.span("sendfile", bytes=length - copied):
+                while copied < length:
+                    n = os.sendfile(dst_fd, src_fd, offset + copied, length - copied)
+                    if n == 0:
+                        return copied
+                    copied += n
+            return copied
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_COPY_ERRORS:
+                raise
+
+    copied += stream_range(src_fd, offset + copied, length - copied, lambda view: write_all(dst_fd, view), buffer_size)
+    return copied
+
+def read_into(fd: int, view: memoryview, offset: int) -> int:
+    """Positional read into an existing buffer; returns the number of bytes read."""
+    if hasattr(os, "preadv"):
+        return os.preadv(fd, [view], offset)
+    data = _read_at(fd, len(view), offset)
+    view[:len(data)] = data
+    return len(data)
+
+def write_all(fd: int, data) -> None:
+    """Writes all of data to fd, retrying after short writes."""
+    view = memoryview(data)
+    with tracing.span("write"):
+        while view:
+            view = view[os.write(fd, view):]
+
+class _BufferPool:
+    """Released copy buffers, kept for reuse so copies don't allocate a fresh buffer per chunk."""
+
+    def __init__(self, limit: int = 32):
+        self._free = {}
+        self._limit = limit  # per buffer size
+        self._lock = threading.Lock()
+
+    def take(self, size: int) -> bytearray:
+        with self._lock:
+            free = self._free.get(size)
+            if free:
+                return free.pop()
+        return bytearray(size)
+
+    def give(self, buffer: bytearray) -> None:
+        with self._lock:
+            free = self._free.setdefault(len(buffer), [])
+            if len(free) < self._limit:
+                free.append(buffer)
+
+_buffers = _BufferPool()
+
+def stream_range(src_fd: int, offset: int, length: int, consume: Callable[[memoryview], None],
+                 buffer_size: int = COPY_BUFFER_SIZE, depth: int = PIPELINE_DEPTH) -> int:
+    """Reads length bytes of src_fd from offset and passes them to consume block by block.
+    Ranges longer than one buffer are read on a helper thread while this thread consumes
+    the previous block, so reading overlaps with writing and hashing. Blocks rotate through
+    depth pooled buffers, and each view is only valid during its consume call.
+    Returns the number of bytes read, which is short only at end of file."""
+    if length <= buffer_size or depth < 2:
+        buffer = _buffers.take(buffer_size)
+        try:
+            view = memoryview(buffer)
+            done = 0
+            while done < length:
+                with tracing.span("read"):
+                    n = read_into(src_fd, view[:min(buffer_size, length - done)], offset + done)
+                if n == 0:
+                    break
+                consume(view[:n])
+                done += n
+            return done
+        finally:
+            _buffers.give(buffer)
+
+    buffers = [_buffers.take(buffer_size) for _ in range(depth)]
+    free = queue.Queue()
+    filled = queue.Queue()
+    for buffer in buffers:
+        free.put(buffer)
+    stop = threading.Event()
+
+    def read_ahead():
+        done = 0
+        try:
+            while done < length and not stop.is_set():
+                buffer = free.get()
+                if buffer is None:
+                    return
+                with tracing.span("read"):
+                    n = read_into(src_fd, memoryview(buffer)[:min(buffer_size, length - done)], offset + done)
+                if n == 0:
+                    break
+                filled.put((buffer, n))
+                done += n
+        except BaseException as e:
+            filled.put(e)
+            return
+        filled.put(None)
+
+    reader = threading.Thread(target=tracing.profiled(read_ahead), daemon=True)
+    reader.start()
+    done = 0
+    try:
+        while True:
+            item = filled.get()
+            if item is None:
+                return done
+            if isinstance(item, BaseException):
+                raise item
+            buffer, n = item
+            consume(memoryview(buffer)[:n])
+            done += n
+            free.put(buffer)
+    finally:
+        stop.set()
+        free.put(None)  # wakes the reader if it is waiting for a buffer
+        reader.join()
+        for buffer in buffers:
+            _buffers.give(buffer)
+
+def hash_range(src_fd: int, offset: int, length: int, dst_fd: Optional[int] = None,
+               algorithm: str = HASH_ALGORITHM, buffer_size: int = COPY_BUFFER_SIZE) -> str:
+    """Hashes length bytes of src_fd starting at offset and returns the hex digest.
+    If dst_fd is given, the same bytes are written to it, so copying and hashing take one read."""
+    digest = new_digest(algorithm)
+
+    def consume(view):
+        with tracing.span("hash"):
+            digest.update(view)
+        if dst_fd is not None:
+            write_all(dst_fd, view)
+
+    stream_range(src_fd, offset, length, consume, buffer_size)
+    return digest.hexdigest()
+
+def compress_range(src_fd: int, offset: int, length: int, dst_fd: int, codec: "chunk_codecs.Codec",
+                   algorithm: Optional[str] = None, buffer_size: int = COPY_BUFFER_SIZE) -> dict:
+    """Compresses length bytes of src_fd starting at offset into dst_fd with a chunk codec.
+    Returns the stored size and, when algorithm is set, the hashes of the stored and raw bytes,
+    all taken in the same single read."""
+    compressor = codec.compressor()
+    stored_digest = new_digest(algorithm) if algorithm else None
+    raw_digest = new_digest(algorithm) if algorithm else None
+    stored = 0
+
+    def emit(data):
+        nonlocal stored
+        if stored_digest:
+            with tracing.span("hash"):
+                stored_digest.update(data)
+        write_all(dst_fd, data)
+        stored += len(data)
+
+    def consume(view):
+        if raw_digest:
+            with tracing.span("hash"):
+                raw_digest.update(view)
+        with tracing.span("compress"):
+            data = compressor.compress(view)
+        emit(data)
+
+    stream_range(src_fd, offset, length, consume, buffer_size)
+    emit(compressor.flush())
+
+    result = {"size": stored}
+    if algorithm:
+        result["hash"] = stored_digest.hexdigest()
+        result["raw_hash"] = raw_digest.hexdigest()
+    return result
+
+_ZERO_BLOCK = bytes(SPARSE_BLOCK)
+
+def data_ranges(fd: int, offset: int, length: int) -> List[Tuple[int, int]]:
+    """Returns the (offset, length) ranges within length bytes of fd from offset that may hold data,
+    found with SEEK_DATA/SEEK_HOLE; the rest are holes. Where the platform or filesystem can't
+    report holes, the whole range comes back as data."""
+    end = offset + length
+    if length <= 0:
+        return []
+    if not hasattr(os, "SEEK_DATA"):
+        return [(offset, length)]
+    ranges = []
+    position = offset
+    try:
+        while position < end:
+            try:
+                data = os.lseek(fd, position, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno == errno.ENXIO:  # nothing but a hole up to the end of the file
+                    break
+                raise
+            if data >= end:
+                break
+            hole = min(os.lseek(fd, data, os.SEEK_HOLE), end)
+            ranges.append((data, hole - data))
+            position = hole
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_COPY_ERRORS:
+            raise
+        return [(offset, length)]
+    return ranges
+
+def sparse_layout(length: int, holes: List[List[int]]) -> List[Tuple[int, int, bool]]:
+    """Splits a chunk's raw range into (offset, length, is_hole) pieces in order, from its hole list."""
+    layout = []
+    position = 0
+    for start, size in holes:
+        if start > position:
+            layout.append((position, start - position, False))
+        layout.append((start, size, True))
+        position = start + size
+    if position < length:
+        layout.append((position, length - position, False))
+    return layout
+
+def sparse_copy_range(src_fd: int, dst_fd: int, offset: int, length: int, algorithm: str = HASH_ALGORITHM,
+                      buffer_size: int = COPY_BUFFER_SIZE) -> dict:
+    """Copies length bytes of src_fd from offset to dst_fd, leaving out holes and zero runs.
+    Holes are skipped without being read; inside data, whole SPARSE_BLOCK-aligned blocks of zeros
+    are left out as well. Returns the stored size, the hash of the stored bytes and the holes
+    as [offset, length] pairs relative to offset."""
+    digest = new_digest(algorithm)
+    holes = []
+    stored = 0
+    position = offset
+
+    def add_hole(start, size):
+        start -= offset
+        if holes and sum(holes[-1]) == start:
+            holes[-1][1] += size
+        else:
+            holes.append([start, size])
+
+    def store(view):
+        nonlocal stored
+        if view:
+            with tracing.span("hash"):
+                digest.update(view)
+            write_all(dst_fd, view)
+            stored += len(view)
+
+    def consume(view):
+        nonlocal position
+        data_start = 0
+        i = 0
+        while i < len(view):
+            # Cut at block boundaries of the source so zero blocks line up with the filesystem's
+            n = min(len(view) - i, SPARSE_BLOCK - position % SPARSE_BLOCK)
+            # startswith compares the full-length slice in place; == on a memoryview unpacks it byte by byte
+            if n == SPARSE_BLOCK and _ZERO_BLOCK.startswith(view[i:i + n]):
+                store(view[data_start:i])
+                add_hole(position, n)
+                data_start = i + n
+            i += n
+            position += n
+        store(view[data_start:])
+
+    with tracing.span("find holes"):
+        ranges = data_ranges(src_fd, offset, length)
+    for data_offset, data_length in ranges:
+        if data_offset > position:
+            add_hole(position, data_offset - position)
+            position = data_offset
+        # Read up to a block boundary first, so no later read splits a block between two buffers
+        head = min(data_length, -data_offset % SPARSE_BLOCK)
+        read = stream_range(src_fd, data_offset, head, consume, buffer_size)
+        read += stream_range(src_fd, data_offset + head, data_length - head, consume, buffer_size)
+        if read < data_length:
+            raise ValueError("Source file ended early; was it changed during the split?")
+    if position < offset + length:
+        add_hole(position, offset + length - position)
+    return {"size": stored, "hash": digest.hexdigest(), "holes": holes}
+
+def root_hash(chunk_hashes: List[str], algorithm: str = HASH_ALGORITHM) -> str:
+    """Whole-file hash of a chunk set: the hash of its chunk hashes in order.
+    It can be built from per-chunk digests, so parallel splits never re-read the source."""
+    digest = new_digest(algorithm)
+    for chunk_hash in chunk_hashes:
+        digest.update(bytes.fromhex(chunk_hash))
+    return digest.hexdigest()
+
+def run_tasks(func, tasks: List[tuple], workers: int) -> list:
+    """Calls func(*task) for every task, on a thread pool when workers > 1.
+    Results come back in task order; the first failure is re-raised."""
+    if workers <= 1 or len(tasks) <= 1:
+        return [func(*task) for task in tasks]
+    from concurrent.futures import ThreadPoolExecutor
+    call = tracing.profiled(lambda task: func(*task))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(call, tasks))
+
+def preallocate(fd: int, size: int) -> None:
+    """Reserves size bytes for fd up front so the filesystem can lay it out contiguously.
+    Silently does nothing where posix_fallocate is unavailable or unsupported."""
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_COPY_ERRORS:
+            raise
+
+def fsync_path(path: str) -> None:
+    """Flushes a file's data, or a directory's entries, to stable storage."""
+    # On Windows os.fsync is FlushFileBuffers, which fails with EBADF on a read-only handle
+    fd = os.open(path, os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    try:
+        with tracing.span("fsync", path=path):
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def fsync_directory(path: str) -> None:
+    """Makes files created or renamed in a directory durable. Does nothing on Windows,
+    where directories can't be opened and renames are journaled by NTFS."""
+    if os.name != "nt":
+        fsync_path(path or ".")
+
+def temp_path(path: str) -> str:
+    """Name a file is written under until it is complete; scans skip these."""
+    return path + scanner.TEMP_SUFFIX
+
+def write_json_atomic(path: str, data: dict, durable: bool = False, indent: Optional[int] = 2) -> None:
+    """Writes JSON under a temporary name and renames it into place, so readers never see half a file."""
+    temp = temp_path(path)
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp, path)
+
+class OperationCancelled(Exception):
+    """Raised at a chunk boundary once a job's cancel_event is set."""
+
+def check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise OperationCancelled("Operation cancelled")
+
+def check_durability(durability: str) -> str:
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability: {durability} (expected one of {', '.join(DURABILITY_LEVELS)})")
+    return durability
+
+class Journal:
+    """Append-only JSON-lines record of completed chunks, used to resume interrupted jobs.
+    The first line describes the job; entries are only reused when it matches exactly."""
+
+    def __init__(self, path: str, header: dict):
+        self.path = path
+        self.header = header
+        self._file = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, dict]:
+        """Returns the completed entries of a previous run of the same job, keyed by chunk name."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return {}
+        
+        entries = {}
+        try:
+            if not lines or json.loads(lines[0]) != self.header:
+                return {}
+            for line in lines[1:]:
+                entry = json.loads(line)
+                entries[entry["name"]] = entry
+        except ValueError:
+            pass  # The last line may be torn if the process was killed mid-write
+        return entries
+
+    def open(self) -> None:
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(json.dumps(self.header) + "\n")
+        self._file.flush()
+
+    def record(self, entry: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+class FileProcessor:
+    @staticmethod
+    def _write_chunk(file_path: str, chunk_path: str, offset: int, length: int,
+                     hash_algorithm: Optional[str] = None, codec: "chunk_codecs.Codec" = None,
+                     sync: bool = False, sparse: bool = False) -> dict:
+        """Writes one byte range of file_path into its own chunk file using positional reads.
+        Returns the chunk's manifest entry; when hash_algorithm is set the range is hashed
+        on the way through, and with a codec it is compressed on the way through.
+        With sparse, holes and zero runs are left out of the chunk and listed in the entry.
+        The chunk only appears under its name once complete (after an fsync with sync)."""
+        entry = {"name": os.path.basename(chunk_path), "size": length}
+        chunk_temp_path = temp_path(chunk_path)
+        with tracing.span("write_chunk", chunk=entry["name"], offset=offset, bytes=length):
+            with contextlib.ExitStack() as files:
+                with tracing.span("open"):
+                    f = files.enter_context(open(file_path, 'rb', buffering=0))
+                    chunk_file = files.enter_context(open(chunk_temp_path, 'wb', buffering=0))
+                if codec:
+                    entry.update(compress_range(f.fileno(), offset, length, chunk_file.fileno(), codec, hash_algorithm))
+                    entry["raw_size"] = length
+                elif sparse:
+                    entry.update(sparse_copy_range(f.fileno(), chunk_file.fileno(), offset, length,
+                                                   hash_algorithm or HASH_ALGORITHM))
+                    if entry["holes"]:
+                        entry["raw_size"] = length
+                    else:
+                        del entry["holes"]
+                elif hash_algorithm:
+                    entry["hash"] = hash_range(f.fileno(), offset, length, chunk_file.fileno(), hash_algorithm)
+                else:
+                    copy_range(f.fileno(), chunk_file.fileno(), offset, length)
+                if sync:
+                    with tracing.span("fsync"):
+                        os.fsync(chunk_file.fileno())
+            with tracing.span("rename"):
+                os.replace(chunk_temp_path, chunk_path)
+        return entry
+
+    @staticmethod
+    def _hash_file(path: str, algorithm: str) -> str:
+        with tracing.span("hash_file", path=path), open(path, 'rb', buffering=0) as f:
+            return hash_range(f.fileno(), 0, os.fstat(f.fileno()).st_size, algorithm=algorithm)
+
+    @staticmethod
+    def _decode_chunk(chunk_path: str, output_fd: int, codec: "chunk_codecs.Codec", buffer_size: int) -> int:
+        """Streams a compressed chunk, decompressed, to output_fd; returns the bytes written."""
+        written = 0
+        with open(chunk_path, 'rb') as f:
+            for piece in codec.decompress(f, buffer_size):
+                view = memoryview(piece)
+                while view:
+                    view = view[os.write(output_fd, view):]
+                written += len(piece)
+        return written
+
+    @staticmethod
+    def _merge_chunk(chunk_path: str, output_path: str, offset: int, length: int, buffer_size: int,
+                     codec: "chunk_codecs.Codec" = None, sync: bool = False, holes: List[List[int]] = None) -> None:
+        """Copies one chunk file into the already-created output at its byte offset.
+        length is the chunk's size once decompressed. With holes, only the data between them is
+        written; the output must be created sparse (truncated, not preallocated) for them to stay holes.
+        With sync, the output is fsynced afterwards."""
+        with tracing.span("merge_chunk", chunk=os.path.basename(chunk_path), offset=offset, bytes=length):
+            with contextlib.ExitStack() as files:
+                with tracing.span("open"):
+                    output_file = files.enter_context(open(output_path, 'r+b', buffering=0))
+                    output_file.seek(offset)
+                if holes:
+                    with open(chunk_path, 'rb', buffering=0) as f:
+                        stored = 0
+                        for start, size, is_hole in sparse_layout(length, holes):
+                            if not is_hole:
+                                output_file.seek(offset + start)
+                                copy_range(f.fileno(), output_file.fileno(), stored, size, buffer_size)
+                                stored += size
+                elif codec:
+                    written = FileProcessor._decode_chunk(chunk_path, output_file.fileno(), codec, buffer_size)
+                    if written != length:
+                        raise ValueError(f"{os.path.basename(chunk_path)} decompressed to {written} bytes, "
+                                         f"expected {length}")
+                else:
+                    with tracing.span("open"):
+                        f = files.enter_context(open(chunk_path, 'rb', buffering=0))
+                    copy_range(f.fileno(), output_file.fileno(), 0, length, buffer_size)
+                if sync:
+                    with tracing.span("fsync"):
+                        os.fsync(output_file.fileno())
+
+    @staticmethod
+    def _range_matches(path: str, offset: int, length: int, expected_hash: str, algorithm: str,
+                       holes: List[List[int]] = None) -> bool:
+        """Checks whether a byte range already on disk has the expected size and hash.
+        With holes, expected_hash is a sparse chunk's: it covers only the data between them."""
+        try:
+            with tracing.span("check_range", path=path, bytes=length), open(path, 'rb', buffering=0) as f:
+                if os.fstat(f.fileno()).st_size < offset + length:
+                    return False
+                if holes:
+                    digest = new_digest(algorithm)
+                    for start, size, is_hole in sparse_layout(length, holes):
+                        if not is_hole and stream_range(f.fileno(), offset + start, size, digest.update) < size:
+                            return False
+                    return digest.hexdigest() == expected_hash
+                return hash_range(f.fileno(), offset, length, algorithm=algorithm) == expected_hash
+        except OSError:
+            return False
+
+    @staticmethod
+    @tracing.traced()
+    def _unchanged_entry(file_path: str, chunk_path: str, offset: int, length: int, entry: Optional[dict],
+                         codec: "chunk_codecs.Codec", algorithm: str) -> Optional[dict]:
+        """Returns the manifest entry of an existing chunk that still holds this byte range of file_path,
+        or None if the chunk has to be written. Without a previous entry, only an uncompressed chunk
+        can be compared, by hashing the chunk file itself."""
+        try:
+            stored_size = os.path.getsize(chunk_path)
+        except OSError:
+            return None
+        if entry is None:
+            if codec or stored_size != length:
+                return None
+            entry = {"name": os.path.basename(chunk_path), "size": length,
+                     "hash": FileProcessor._hash_file(chunk_path, algorithm)}
+        if entry.get("raw_size", entry["size"]) != length or entry["size"] != stored_size:
+            return None
+        if entry.get("holes"):
+            # A sparse chunk holds only the data, so the range is scanned the way the split did and compared
+            with open(file_path, 'rb', buffering=0) as f, open(os.devnull, 'wb', buffering=0) as sink:
+                scanned = sparse_copy_range(f.fileno(), sink.fileno(), offset, length, algorithm)
+            return entry if scanned["hash"] == entry["hash"] and scanned["holes"] == entry["holes"] else None
+        if not FileProcessor._range_matches(file_path, offset, length, entry.get("raw_hash", entry["hash"]), algorithm):
+            return None
+        return entry
+
+    @staticmethod
+    @tracing.traced()
+    def split_file(file_path: str, chunk_size: int = CHUNK_SIZE, delete_original: bool = False, output_dir: str = None,
+                   workers: int = 1, manifest: bool = True, resume: bool = False, content_defined: bool = False,
+                   codec: str = "none", progress_callback: Callable[[dict], None] = None,
+                   durability: str = "none", update: bool = False, cancel_event: threading.Event = None,
+                   sparse: bool = False) -> int:
+        """Splits a large file into chunks.
+        With content_defined, boundaries follow the file's content (chunk_size is the
+        average) so small edits only change nearby chunks; otherwise, or with a warning
+        when numpy is missing, they are fixed offsets.
+        With workers > 1, chunk ranges are written concurrently on a thread pool.
+        With manifest, chunks are hashed while they are copied and a sidecar manifest
+        is written; without it, chunks are copied inside the kernel where possible.
+        Completed chunks are recorded in a journal; with resume, chunks from an
+        interrupted run whose size and hash still match are kept instead of rewritten.
+        codec compresses each chunk independently ("none", "zlib", "lzma" or, if installed,
+        "zstd"); with workers > 1 chunks compress in parallel. The codec is recorded in the
+        manifest so merge_files can decompress without being told.
+        progress_callback receives a metrics.TransferMetrics event after every chunk and a
+        summary at the end (bytes done, MB/s, ETA, per-chunk timings).
+        Chunks and the manifest are written under temporary names and renamed when complete.
+        durability sets when they are fsynced: "none", "job" (all at once at the end, plus
+        the directory) or "chunk" (each one as it is written). delete_original implies at
+        least "job", so the original is only removed once its chunks are on disk.
+        With update, the file is compared with the chunks of an earlier split using the old
+        manifest's sizes and hashes: only chunks whose bytes changed are rewritten, parts past
+        the new end are removed, and unchanged chunk files (and their mtimes) are left alone.
+        Setting cancel_event stops the split before its next chunk with OperationCancelled; the
+        chunks this run wrote (unless updating) and its journal are removed.
+        With sparse, holes (found with SEEK_DATA/SEEK_HOLE) and runs of zero blocks are left out
+        of the chunks and recorded in the manifest, and merge_files recreates them as holes.
+        Returns the number of chunks created."""
+        chunk_codec = chunk_codecs.get_codec(codec)
+        check_durability(durability)
+        if sparse and chunk_codec:
+            raise ValueError("sparse can't be combined with a codec; compression already stores zero runs compactly")
+        if sparse and not manifest:
+            raise ValueError("sparse chunks need a manifest to record their holes")
+        if delete_original and durability == "none":
+            durability = "job"
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        logger.info("Splitting file: %s", file_path)
+        if content_defined:
+            from . import cdc
+            if not cdc.has_numpy():
+                logger.warning("numpy is not installed; splitting %s at fixed offsets, since scanning "
+                               "for content-defined boundaries without it takes minutes per GB", file_path)
+                content_defined = False
+
+        file_dir, file_name = os.path.split(file_path)
+        file_name, file_ext = os.path.splitext(file_name)
+        
+        # Use specified output directory if provided, otherwise use original file's directory
+        output_directory = output_dir if output_dir else file_dir
+        if output_directory:
+            os.makedirs(output_directory, exist_ok=True)
+        
+        file_stat = os.stat(file_path)
+        file_size = file_stat.st_size
+        
+        with tracing.span("plan chunks", file=file_path, bytes=file_size, content_defined=content_defined):
+            if content_defined:
+                boundaries = cdc.chunk_ranges(file_path, chunk_size)
+            else:
+                boundaries = [(offset, min(chunk_size, file_size - offset))
+                              for offset in range(0, file_size, chunk_size)]
+        
+        # Every chunk's byte range is known up front, so chunks can be written in any order
+        chunk_ranges = []
+        for chunk_index, (offset, length) in enumerate(boundaries):
+            chunk_filename = f"{file_name}_part{chunk_index:03d}{file_ext}"
+            chunk_path = os.path.join(output_directory, chunk_filename)
+            chunk_ranges.append((chunk_path, offset, length))
+        
+        manifest_path = os.path.join(output_directory, f"{file_name}{file_ext}{MANIFEST_SUFFIX}")
+        previous_manifest = None
+        previous = {}
+        if update:
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    previous_manifest = json.load(f)
+            except (OSError, ValueError):
+                pass
+            # Entries of a different file, hash or codec say nothing about these chunks
+            if (previous_manifest and previous_manifest.get("file_name") == f"{file_name}{file_ext}"
+                    and previous_manifest.get("algorithm") == HASH_ALGORITHM
+                    and previous_manifest.get("codec", "none") == (codec or "none")):
+                previous = {chunk["name"]: chunk for chunk in previous_manifest["chunks"]}
+        
+        # Hashes are what make a checkpoint trustworthy, so resuming (and updating) always hashes
+        hash_algorithm = HASH_ALGORITHM if manifest or resume or update else None
+        journal = None
+        completed = {}
+        if hash_algorithm:
+            journal = Journal(os.path.join(output_directory, f"{file_name}{file_ext}{JOURNAL_SUFFIX}"), {
+                "file_name": f"{file_name}{file_ext}",
+                "size": file_size,
+                "mtime_ns": file_stat.st_mtime_ns,
+                "chunk_size": chunk_size,
+                "content_defined": content_defined,
+                "codec": codec or "none",
+                "algorithm": hash_algorithm,
+            })
+            if resume:
+                completed = journal.load()
+        
+        metrics = TransferMetrics("split", file_path, file_size, len(chunk_ranges), progress_callback)
+        written_paths = []
+        
+        def write_chunk(chunk_path, offset, length):
+            check_cancelled(cancel_event)
+            started = time.perf_counter()
+            chunk_name = os.path.basename(chunk_path)
+            entry = completed.get(chunk_name)
+            if not (entry and entry.get("raw_size", entry["size"]) == length and os.path.isfile(chunk_path)
+                    and os.path.getsize(chunk_path) == entry["size"]
+                    and FileProcessor._range_matches(chunk_path, 0, entry["size"], entry["hash"], hash_algorithm)):
+                entry = None
+                if update:
+                    entry = FileProcessor._unchanged_entry(file_path, chunk_path, offset, length,
+                                                           previous.get(chunk_name), chunk_codec, hash_algorithm)
+                if entry is None:
+                    entry = FileProcessor._write_chunk(file_path, chunk_path, offset, length, hash_algorithm,
+                                                       chunk_codec, durability == "chunk", sparse)
+                    written_paths.append(chunk_path)
+            if journal:
+                journal.record(entry)
+            metrics.add_chunk(chunk_name, length, time.perf_counter() - started)
+            return entry
+        
+        if journal:
+            journal.open()
+        try:
+            with tracing.span("write chunks", chunks=len(chunk_ranges), workers=workers):
+                chunk_entries = run_tasks(write_chunk, chunk_ranges, workers)
+        except OperationCancelled:
+            if journal:
+                journal.close()
+                journal.remove()
+            # A partial set of fresh chunks would pass for a short split; an update keeps its progress
+            if not update:
+                for chunk_path in written_paths:
+                    try:
+                        os.remove(chunk_path)
+                    except OSError:
+                        pass
+            raise
+        finally:
+            if journal:
+                journal.close()
+        
+        if durability == "job":
+            # Group commit: one pass of fsyncs at the end instead of one stall per chunk
+            with tracing.span("fsync chunks", chunks=len(written_paths)):
+                run_tasks(fsync_path, [(chunk_path,) for chunk_path in written_paths], workers)
+        
+        if update:
+            # Parts past the new end are left over from a longer version of the file
+            with os.scandir(output_directory or ".") as entries:
+                for dir_entry in entries:
+                    part = scanner.split_part_name(dir_entry.name)
+                    if (part and part[0] == file_name and part[1] >= len(chunk_ranges)
+                            and dir_entry.name == f"{file_name}_part{part[1]:03d}{file_ext}"):
+                        os.remove(dir_entry.path)
+            logger.info("Rewrote %d of %d chunks of %s", len(written_paths), len(chunk_ranges), file_path)
+        
+        if manifest:
+            manifest_data = {
+                "file_name": f"{file_name}{file_ext}",
+                "size": file_size,
+                "chunk_size": chunk_size,
+                "content_defined": content_defined,
+                "codec": codec or "none",
+                "algorithm": HASH_ALGORITHM,
+                "hash": root_hash([entry["hash"] for entry in chunk_entries]),
+                "chunks": chunk_entries,
+            }
+            if manifest_data != previous_manifest:
+                with tracing.span("write manifest"):
+                    write_json_atomic(manifest_path, manifest_data, durability != "none")
+        elif os.path.exists(manifest_path):
+            # A manifest left over from an earlier split would no longer match these chunks
+            os.remove(manifest_path)
+        
+        if durability != "none":
+            fsync_directory(output_directory)
+        
+        if journal:
+            journal.remove()
+        
+        if delete_original:
+            os.remove(file_path)
+        
+        metrics.finish()
+        return len(chunk_ranges)
+
+    @staticmethod
+    @tracing.traced()
+    def merge_files(output_path: str, chunk_paths: List[str], delete_chunks: bool = False,
+                    buffer_size: int = COPY_BUFFER_SIZE, workers: int = 1, verify: bool = True,
+                    resume: bool = False, codec: str = None,
+                    progress_callback: Callable[[dict], None] = None, durability: str = "none",
+                    cancel_event: threading.Event = None) -> None:
+        """Merges chunks back into a single file.
+        Chunks are streamed into a preallocated output; buffer_size bounds memory use
+        when the kernel copy path isn't available. With workers > 1, each chunk is
+        copied to its own offset concurrently on a thread pool. If the chunk set has a
+        manifest and verify is set, the chunks are checked against it before merging.
+        Completed chunks are recorded in a journal; with resume, chunks an interrupted
+        run already wrote to the output are kept if their bytes still hash correctly.
+        Compressed chunks are decompressed as they stream; codec defaults to the one
+        in the manifest and only needs to be given for chunk sets without one.
+        progress_callback receives the same chunk and summary events as in split_file.
+        The output is built under a temporary name and renamed when complete; durability
+        works as in split_file, with delete_chunks implying at least "job".
+        Setting cancel_event stops the merge before its next chunk with OperationCancelled and
+        removes the partial output and its journal."""
+        check_durability(durability)
+        if delete_chunks and durability == "none":
+            durability = "job"
+        
+        # Ensure chunks are sorted numerically by their part number
+        chunk_paths.sort(key=scanner.part_number)
+        
+        with tracing.span("load manifest", verify=verify):
+            manifest_path, manifest = FileProcessor.load_manifest(chunk_paths, verify, workers)
+        manifest_chunks = {}
+        algorithm = HASH_ALGORITHM
+        if manifest:
+            algorithm = manifest.get("algorithm", HASH_ALGORITHM)
+            manifest_chunks = {chunk["name"]: chunk for chunk in manifest["chunks"]}
+            codec = codec or manifest.get("codec")
+        chunk_codec = chunk_codecs.get_codec(codec)
+        
+        # Ensure output directory exists
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+        
+        partial_path = temp_path(output_path)
+        try:
+            if chunk_codec and not manifest_path:
+                # Without a manifest the decompressed sizes, and so the offsets, are only known as we go;
+                # progress counts compressed bytes read
+                chunk_sizes = [os.path.getsize(chunk_path) for chunk_path in chunk_paths]
+                metrics = TransferMetrics("merge", output_path, sum(chunk_sizes), len(chunk_paths), progress_callback)
+                with open(partial_path, 'wb', buffering=0) as output_file:
+                    for chunk_path, chunk_size in zip(chunk_paths, chunk_sizes):
+                        check_cancelled(cancel_event)
+                        metrics.timed(os.path.basename(chunk_path), chunk_size, FileProcessor._decode_chunk,
+                                      chunk_path, output_file.fileno(), chunk_codec, buffer_size)
+                        if durability == "chunk":
+                            os.fsync(output_file.fileno())
+            else:
+                metrics = FileProcessor._merge_positional(partial_path, chunk_paths, manifest_chunks, algorithm,
+                                                          chunk_codec, buffer_size, workers, resume, progress_callback,
+                                                          durability == "chunk", output_path, cancel_event)
+        except OperationCancelled:
+            for path in (partial_path, output_path + JOURNAL_SUFFIX):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            raise
+        
+        if durability == "job":
+            fsync_path(partial_path)
+        os.replace(partial_path, output_path)
+        if durability != "none":
+            fsync_directory(output_dir)
+        
+        if delete_chunks:
+            for chunk_path in chunk_paths + ([manifest_path] if manifest_path else []):
+                try:
+                    os.remove(chunk_path)
+                except OSError:
+                    pass
+        
+        metrics.finish()
+
+    @staticmethod
+    @tracing.traced()
+    def _merge_positional(output_path: str, chunk_paths: List[str], manifest_chunks: Dict[str, dict], algorithm: str,
+                          codec: "chunk_codecs.Codec", buffer_size: int, workers: int, resume: bool,
+                          progress_callback: Callable[[dict], None] = None, sync: bool = False,
+                          final_path: str = None, cancel_event: threading.Event = None) -> TransferMetrics:
+        """Writes every chunk at its own offset of a preallocated output, journaling completed chunks.
+        output_path is the file being built; final_path, where it will be renamed to, names the
+        journal and the metrics. Returns the metrics of the copy."""
+        final_path = final_path or output_path
+        chunk_sizes = [os.path.getsize(chunk_path) for chunk_path in chunk_paths]
+        # Where each chunk lands in the output depends on its decompressed size
+        output_sizes = [manifest_chunks.get(os.path.basename(chunk_path), {}).get("raw_size", chunk_size)
+                        for chunk_path, chunk_size in zip(chunk_paths, chunk_sizes)]
+        
+        journal = Journal(final_path + JOURNAL_SUFFIX, {
+            "chunks": [[os.path.basename(chunk_path), chunk_size]
+                       for chunk_path, chunk_size in zip(chunk_paths, chunk_sizes)],
+            "algorithm": algorithm,
+        })
+        completed = journal.load() if resume and os.path.isfile(output_path) else {}
+        
+        sparse = any(chunk.get("holes") for chunk in manifest_chunks.values())
+        with open(output_path, 'r+b' if completed else 'wb', buffering=0) as output_file:
+            with tracing.span("allocate output", bytes=sum(output_sizes), sparse=sparse):
+                if sparse:
+                    # Reserving blocks would fill the holes in; extending the file leaves them unallocated
+                    os.ftruncate(output_file.fileno(), sum(output_sizes))
+                else:
+                    preallocate(output_file.fileno(), sum(output_sizes))
+        
+        metrics = TransferMetrics("merge", final_path, sum(output_sizes), len(chunk_paths), progress_callback)
+        
+        def merge_chunk(chunk_path, offset, output_size):
+            check_cancelled(cancel_event)
+            started = time.perf_counter()
+            chunk_name = os.path.basename(chunk_path)
+            chunk = manifest_chunks.get(chunk_name, {})
+            # Hash of the bytes this chunk contributes to the output; for a sparse chunk, of its data only
+            chunk_hash = chunk.get("raw_hash", chunk.get("hash"))
+            entry = None
+            if chunk_name in completed:
+                expected_hash = chunk_hash or FileProcessor._hash_file(chunk_path, algorithm)
+                if FileProcessor._range_matches(output_path, offset, output_size, expected_hash, algorithm,
+                                                chunk.get("holes")):
+                    entry = completed[chunk_name]
+            if entry is None:
+                FileProcessor._merge_chunk(chunk_path, output_path, offset, output_size, buffer_size, codec, sync,
+                                           chunk.get("holes"))
+                entry = {"name": chunk_name, "size": output_size, "hash": chunk_hash}
+            journal.record(entry)
+            metrics.add_chunk(chunk_name, output_size, time.perf_counter() - started)
+        
+        tasks = []
+        offset = 0
+        for chunk_path, output_size in zip(chunk_paths, output_sizes):
+            tasks.append((chunk_path, offset, output_size))
+            offset += output_size
+        
+        journal.open()
+        try:
+            with tracing.span("merge chunks", chunks=len(tasks), workers=workers):
+                run_tasks(merge_chunk, tasks, workers)
+        finally:
+            journal.close()
+        journal.remove()
+        return metrics
+
+    @staticmethod
+    def merge_output_path(directory: str, prefix: str, chunks: List[str], output_dir: str = None) -> str:
+        """Returns where a chunk group found in directory is merged to: its original name,
+        next to the chunks or directly in output_dir."""
+        output_path = f"{prefix}{os.path.splitext(chunks[0])[1]}"
+        if output_dir:
+            return os.path.join(output_dir, os.path.basename(output_path))
+        return os.path.join(directory, output_path)
+
+    @staticmethod
+    def load_manifest(chunk_paths: List[str], verify: bool = True,
+                      workers: int = 1) -> Tuple[Optional[str], Optional[dict]]:
+        """Returns (manifest path, manifest) for sorted chunk paths, or (None, None) without one.
+        With verify, the chunks are checked against it and any problem raises ValueError."""
+        manifest_path = FileProcessor.find_manifest(chunk_paths)
+        if not manifest_path:
+            return None, None
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        if verify:
+            problems = FileProcessor.verify_chunks(manifest_path, max(workers, 1))
+            chunk_names = [os.path.basename(chunk_path) for chunk_path in chunk_paths]
+            expected_names = [chunk["name"] for chunk in manifest["chunks"]]
+            if chunk_names != expected_names:
+                problems.append(f"chunk list does not match manifest ({len(chunk_names)} given, "
+                                f"{len(expected_names)} expected)")
+            if problems:
+                raise ValueError(f"Chunk verification failed: {'; '.join(problems)}")
+        return manifest_path, manifest
+
+    @staticmethod
+    def find_manifest(chunk_paths: List[str]) -> Optional[str]:
+        """Returns the manifest path for a chunk group if one exists next to its first chunk."""
+        if not chunk_paths:
+            return None
+        chunk_dir, chunk_name = os.path.split(chunk_paths[0])
+        prefix = scanner.PART_PATTERN.split(chunk_name, 1)[0]
+        manifest_path = os.path.join(chunk_dir, f"{prefix}{os.path.splitext(chunk_name)[1]}{MANIFEST_SUFFIX}")
+        return manifest_path if os.path.isfile(manifest_path) else None
+
+    @staticmethod
+    @tracing.traced()
+    def verify_chunks(manifest_path: str, workers: int = DEFAULT_WORKERS) -> List[str]:
+        """Checks every chunk listed in a manifest for presence, size and hash.
+        Chunks are hashed concurrently. Returns a list of problems; empty means the set is intact."""
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        chunk_dir = os.path.dirname(manifest_path)
+        algorithm = manifest.get("algorithm", HASH_ALGORITHM)
+        problems = []
+        to_hash = []
+        for chunk in manifest["chunks"]:
+            chunk_path = os.path.join(chunk_dir, chunk["name"])
+            if not os.path.isfile(chunk_path):
+                problems.append(f"{chunk['name']} is missing")
+            elif os.path.getsize(chunk_path) != chunk["size"]:
+                problems.append(f"{chunk['name']} has size {os.path.getsize(chunk_path)}, expected {chunk['size']}")
+            else:
+                to_hash.append(chunk)
+        
+        if sum(chunk.get("raw_size", chunk["size"]) for chunk in manifest["chunks"]) != manifest["size"]:
+            problems.append("chunk sizes do not add up to the original size")
+        if root_hash([chunk["hash"] for chunk in manifest["chunks"]], algorithm) != manifest["hash"]:
+            problems.append("manifest hash does not match its chunk hashes")
+        
+        with tracing.span("hash chunks", chunks=len(to_hash), workers=workers):
+            digests = run_tasks(FileProcessor._hash_file,
+                                [(os.path.join(chunk_dir, chunk["name"]), algorithm) for chunk in to_hash], workers)
+        for chunk, digest in zip(to_hash, digests):
+            if digest != chunk["hash"]:
+                problems.append(f"{chunk['name']} is corrupt (hash mismatch)")
+        
+        return problems
+
+    @staticmethod
+    @tracing.traced()
+    def find_large_files(directory: str, min_size: int = CHUNK_SIZE, recursive: bool = False,
+                         index_path: str = None) -> List[str]:
+        """Returns list of files larger than min_size, as paths relative to directory.
+        recursive includes subdirectories; index_path enables the cached scan index."""
+        return [path for path, size in scanner.scan_files(directory, recursive, index_path)
+                if size > min_size and not scanner.PART_PATTERN.search(os.path.basename(path))
+                and not path.endswith(scanner.TEMP_SUFFIX)]
+
+    @staticmethod
+    @tracing.traced()
+    def find_chunk_groups(directory: str, recursive: bool = False, index_path: str = None) -> Dict[str, List[str]]:
+        """Finds all chunked files grouped by their base name, each group sorted by part number."""
+        return scanner.group_chunks(scanner.iter_listings(directory, recursive, index_path, with_sizes=False))
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""Progress and throughput reporting for splits and merges.
+
+A TransferMetrics is created per job once its total size is known, and each finished
+chunk is added to it with the time it took. Every addition produces a "chunk" event
+and the end of the job a "summary" event; both are plain dicts so front ends can
+show them or write them out as JSON. Events are passed to a callback, which may be
+called from worker threads.
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+MB = 1024 * 1024
+
+class TransferMetrics:
+    """Counts bytes and per-chunk timings for one split or merge.
+    bytes_total and chunks_total may be None when the input is a stream of unknown length."""
+
+    def __init__(self, operation: str, file_path: str, bytes_total: Optional[int], chunks_total: Optional[int],
+                 callback: Optional[Callable[[dict], None]] = None):
+        self.operation = operation
+        self.file_path = file_path
+        self.bytes_total = bytes_total
+        self.chunks_total = chunks_total
+        self.callback = callback
+        self.bytes_done = 0
+        self.chunk_timings = []  # [chunk name, bytes, seconds] in completion order
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _rates(self, bytes_done: int) -> dict:
+        elapsed = time.perf_counter() - self.started
+        rate = bytes_done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if rate > 0 and self.bytes_total is not None:
+            eta = round((self.bytes_total - bytes_done) / rate, 1)
+        return {"elapsed": round(elapsed, 3), "mb_per_s": round(rate / MB, 2), "eta_seconds": eta}
+
+    def add_chunk(self, chunk_name: str, length: int, seconds: float) -> None:
+        """Records a finished chunk and reports a "chunk" event."""
+        with self._lock:
+            self.bytes_done += length
+            self.chunk_timings.append([chunk_name, length, round(seconds, 4)])
+            event = {
+                "event": "chunk",
+                "operation": self.operation,
+                "file": self.file_path,
+                "chunk": chunk_name,
+                "chunk_bytes": length,
+                "chunk_seconds": round(seconds, 4),
+                "chunks_done": len(self.chunk_timings),
+                "chunks_total": self.chunks_total,
+                "bytes_done": self.bytes_done,
+                "bytes_total": self.bytes_total,
+            }
+            event.update(self._rates(self.bytes_done))
+        if self.callback:
+            self.callback(event)
+
+    def timed(self, chunk_name: str, length: int, func: Callable, *args):
+        """Runs func(*args) and records it as one chunk of length bytes; returns its result."""
+        started = time.perf_counter()
+        result = func(*args)
+        self.add_chunk(chunk_name, length, time.perf_counter() - started)
+        return result
+
+    def summary(self) -> dict:
+        """Returns the totals for the job; also reported as a "summary" event by finish()."""
+        with self._lock:
+            seconds = [timing[2] for timing in self.chunk_timings]
+            summary = {
+                "event": "summary",
+                "operation": self.operation,
+                "file": self.file_path,
+                "bytes_total": self.bytes_done,
+                "chunks": len(self.chunk_timings),
+                "chunk_seconds_min": min(seconds) if seconds else None,
+                "chunk_seconds_max": max(seconds) if seconds else None,
+                "chunk_seconds_mean": round(sum(seconds) / len(seconds), 4) if seconds else None,
+                "chunk_timings": list(self.chunk_timings),
+            }
+            summary.update(self._rates(self.bytes_done))
+        del summary["eta_seconds"]
+        return summary
+
+    def finish(self) -> dict:
+        """Reports the "summary" event and returns it."""
+        summary = self.summary()
+        if self.callback:
+            self.callback(summary)
+        return summary
\ No newline at end of file
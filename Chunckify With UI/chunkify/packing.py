@@ -0,0 +1,334 @@
+"""Pack mode: many small files streamed into a few chunk-sized bundles, and back.
+
+Splitting leaves files under the chunk size alone, so a folder of small assets would
+still move as one object per file. A pack concatenates them into _partNNN bundles of
+about the chunk size, cut between members, plus an index of (path, offset, length)
+whose offsets count from the start of the first bundle. Unpacking reads the bundles
+front to back; a single member is read with positional reads of just the bundle that
+holds it. Bundles use their own extension so they are never taken for a split file.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_right
+from typing import Callable, Iterator, List, Tuple
+
+from . import scanner
+from . import tracing
+from .chunk_store import RECIPE_SUFFIX
+from .core import (FileProcessor, CHUNK_SIZE, COPY_BUFFER_SIZE, HASH_ALGORITHM, JOURNAL_SUFFIX, MANIFEST_SUFFIX,
+                   OperationCancelled, check_cancelled, check_durability, copy_range, fsync_directory, fsync_path,
+                   new_digest, read_into, run_tasks, stream_range, temp_path, write_json_atomic)
+from .metrics import TransferMetrics
+
+logger = logging.getLogger(__name__)
+
+PACK_INDEX_SUFFIX = scanner.PACK_EXTENSION + ".json"  # e.g. Content.chunkpack.json next to Content_part000.chunkpack
+
+# Files this tool writes itself, which are never packed
+_OWN_SUFFIXES = (scanner.TEMP_SUFFIX, MANIFEST_SUFFIX, JOURNAL_SUFFIX, RECIPE_SUFFIX, PACK_INDEX_SUFFIX)
+
+def find_small_files(directory: str, chunk_size: int = CHUNK_SIZE, recursive: bool = False,
+                     index_path: str = None) -> List[Tuple[str, int]]:
+    """Returns (path relative to directory, size) for every file find_large_files would skip, sorted by path."""
+    return [(path, size) for path, size in scanner.scan_files(directory, recursive, index_path)
+            if size <= chunk_size and not scanner.PART_PATTERN.search(os.path.basename(path))
+            and not path.endswith(_OWN_SUFFIXES)]
+
+def find_packs(directory: str, recursive: bool = False, index_path: str = None) -> List[str]:
+    """Returns the pack indexes in a directory, as paths relative to it."""
+    return [path for path, _ in scanner.scan_files(directory, recursive, index_path)
+            if path.endswith(PACK_INDEX_SUFFIX)]
+
+def _member_path(directory: str, member: str) -> str:
+    """Where a member named in an index lives under directory; rejects names that would escape it."""
+    parts = member.split("/")
+    if member.startswith("/") or any(part in ("", ".", "..") for part in parts) or ":" in parts[0]:
+        raise ValueError(f"Unsafe member path in pack index: {member!r}")
+    return os.path.join(directory, *parts)
+
+def _write_bundle(directory: str, bundle_path: str, files: List[Tuple[str, int]], sync: bool) -> Tuple[dict, list]:
+    """Streams files one after another into a bundle; returns its index entry and each member's length.
+    Members are copied at their size when opened, not the listed one, which a cached scan may have
+    recorded before the file last changed."""
+    digest = new_digest(HASH_ALGORITHM)
+    lengths = []
+    with open(temp_path(bundle_path), 'wb', buffering=COPY_BUFFER_SIZE) as bundle:
+        def consume(view):
+            digest.update(view)
+            bundle.write(view)
+
+        for path, _ in files:
+            with open(os.path.join(directory, path), 'rb', buffering=0) as f:
+                lengths.append(stream_range(f.fileno(), 0, os.fstat(f.fileno()).st_size, consume))
+        bundle.flush()
+        if sync:
+            os.fsync(bundle.fileno())
+    os.replace(temp_path(bundle_path), bundle_path)
+    return {"name": os.path.basename(bundle_path), "size": sum(lengths), "hash": digest.hexdigest()}, lengths
+
+@tracing.traced()
+def pack_files(directory: str, name: str = None, chunk_size: int = CHUNK_SIZE, output_dir: str = None,
+               recursive: bool = False, delete_originals: bool = False, workers: int = 1,
+               progress_callback: Callable[[dict], None] = None, durability: str = "none",
+               index_path: str = None, cancel_event: threading.Event = None) -> str:
+    """Packs every file of directory at or under chunk_size into name_partNNN bundles and an index,
+    in the directory itself or output_dir. name defaults to the directory's name. Bundles are
+    written concurrently with workers > 1, and each one appears under its name once complete.
+    durability works as in split_file; delete_originals implies at least "job".
+    index_path enables the cached scan index. Setting cancel_event stops before the next bundle
+    with OperationCancelled and removes the bundles already written. Returns the pack index path."""
+    check_durability(durability)
+    if delete_originals and durability == "none":
+        durability = "job"
+    name = name or os.path.basename(os.path.abspath(directory))
+    output_directory = output_dir or directory
+    os.makedirs(output_directory, exist_ok=True)
+
+    files = find_small_files(directory, chunk_size, recursive, index_path)
+    logger.info("Packing %d files from %s", len(files), directory)
+
+    # Bundles are planned from the listed sizes, then filled in any order
+    groups = []
+    current, current_size = [], 0
+    for path, size in files:
+        if current and current_size + size > chunk_size:
+            groups.append(current)
+            current, current_size = [], 0
+        current.append((path, size))
+        current_size += size
+    if current:
+        groups.append(current)
+    bundle_paths = [os.path.join(output_directory, f"{name}_part{index:03d}{scanner.PACK_EXTENSION}")
+                    for index in range(len(groups))]
+
+    metrics = TransferMetrics("pack", directory, sum(size for _, size in files), len(groups), progress_callback)
+
+    written_paths = []
+
+    def write_bundle(bundle_path, group):
+        check_cancelled(cancel_event)
+        started = time.perf_counter()
+        result = _write_bundle(directory, bundle_path, group, durability == "chunk")
+        written_paths.append(bundle_path)
+        metrics.add_chunk(os.path.basename(bundle_path), result[0]["size"], time.perf_counter() - started)
+        return result
+
+    try:
+        results = run_tasks(write_bundle, list(zip(bundle_paths, groups)), workers)
+    except OperationCancelled:
+        for bundle_path in written_paths:
+            os.remove(bundle_path)
+        raise
+
+    # Offsets count from the start of the first bundle, as if the bundles were one file
+    members = []
+    offset = 0
+    for group, (_, lengths) in zip(groups, results):
+        for (path, _), length in zip(group, lengths):
+            members.append([path.replace(os.sep, "/"), offset, length])
+            offset += length
+
+    if durability == "job":
+        run_tasks(fsync_path, [(bundle_path,) for bundle_path in bundle_paths], workers)
+    pack_index_path = os.path.join(output_directory, f"{name}{PACK_INDEX_SUFFIX}")
+    pack_index = {
+        "name": name,
+        "size": offset,
+        "chunk_size": chunk_size,
+        "algorithm": HASH_ALGORITHM,
+        "bundles": [entry for entry, _ in results],
+        "members": members,
+    }
+    # Unindented, since with hundreds of thousands of members whitespace would outweigh the paths
+    write_json_atomic(pack_index_path, pack_index, durability != "none", indent=None)
+    # Bundles past the new last one belong to an earlier, larger pack of the same name
+    with os.scandir(output_directory) as entries:
+        for dir_entry in entries:
+            part = scanner.split_part_name(dir_entry.name)
+            if (part and part[0] == name and part[1] >= len(bundle_paths)
+                    and dir_entry.name.endswith(scanner.PACK_EXTENSION)):
+                os.remove(dir_entry.path)
+    if durability != "none":
+        fsync_directory(output_directory)
+
+    if delete_originals:
+        # A file that changed size after it was packed is kept, since the pack no longer holds all of it
+        for path, _, length in members:
+            original_path = os.path.join(directory, *path.split("/"))
+            if os.path.getsize(original_path) == length:
+                os.remove(original_path)
+            else:
+                logger.warning("Kept %s: it changed while being packed", original_path)
+
+    metrics.finish()
+    return pack_index_path
+
+class PackReader:
+    """Reads members of a pack through its index. Only the bundles holding a member are opened,
+    one at a time, so reads in pack order stream through the bundles."""
+
+    def __init__(self, index_path: str):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.index_path = index_path
+        self.directory = os.path.dirname(index_path)
+        self.bundle_paths = [os.path.join(self.directory, bundle["name"]) for bundle in self.index["bundles"]]
+        self._starts = []
+        start = 0
+        for bundle in self.index["bundles"]:
+            self._starts.append(start)
+            start += bundle["size"]
+        self._members = {path: (offset, length) for path, offset, length in self.index["members"]}
+        self._open_bundle = None
+        self._open_file = None
+        self._made_dirs = set()
+
+    def __enter__(self) -> "PackReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def members(self) -> List[str]:
+        """Member paths in pack order, with "/" as the separator."""
+        return [path for path, _, _ in self.index["members"]]
+
+    def verify(self, workers: int = 1) -> List[str]:
+        """Checks every bundle's size and hash; returns a list of problems, empty if the pack is intact."""
+        problems = []
+        present = []
+        for bundle, bundle_path in zip(self.index["bundles"], self.bundle_paths):
+            if not os.path.isfile(bundle_path):
+                problems.append(f"{bundle['name']}: missing")
+            elif os.path.getsize(bundle_path) != bundle["size"]:
+                problems.append(f"{bundle['name']}: size {os.path.getsize(bundle_path)}, expected {bundle['size']}")
+            else:
+                present.append((bundle, bundle_path))
+        digests = run_tasks(FileProcessor._hash_file,
+                            [(bundle_path, self.index["algorithm"]) for _, bundle_path in present], workers)
+        problems.extend(f"{bundle['name']}: hash mismatch"
+                        for (bundle, _), digest in zip(present, digests) if digest != bundle["hash"])
+        return problems
+
+    def bundle_of(self, offset: int) -> int:
+        """Index of the bundle holding the byte at offset of the pack."""
+        return bisect_right(self._starts, offset) - 1
+
+    def _fd(self, bundle_index: int) -> int:
+        if self._open_bundle != bundle_index:
+            self.close()
+            self._open_file = open(self.bundle_paths[bundle_index], 'rb', buffering=0)
+            self._open_bundle = bundle_index
+        return self._open_file.fileno()
+
+    def _pieces(self, member: str) -> Iterator[Tuple[int, int, int]]:
+        """Yields (bundle index, offset in bundle, length) for the bytes of a member."""
+        try:
+            offset, length = self._members[member]
+        except KeyError:
+            raise KeyError(f"No member {member!r} in {os.path.basename(self.index_path)}") from None
+        index = self.bundle_of(offset)
+        while length > 0:
+            bundle_offset = offset - self._starts[index]
+            n = min(length, self.index["bundles"][index]["size"] - bundle_offset)
+            yield index, bundle_offset, n
+            offset += n
+            length -= n
+            index += 1
+
+    def read(self, member: str) -> bytes:
+        """Returns the contents of one member."""
+        pieces = list(self._pieces(member))
+        buffer = bytearray(sum(length for _, _, length in pieces))
+        view = memoryview(buffer)
+        done = 0
+        for index, bundle_offset, length in pieces:
+            n = read_into(self._fd(index), view[done:done + length], bundle_offset)
+            if n < length:
+                raise ValueError(f"{os.path.basename(self.bundle_paths[index])} is shorter than expected")
+            done += n
+        return bytes(buffer)
+
+    def extract(self, member: str, output_dir: str, sync: bool = False) -> str:
+        """Writes one member to its relative path under output_dir and returns the path written.
+        With sync, the file is fsynced before it is closed."""
+        output_path = _member_path(output_dir, member)
+        parent = os.path.dirname(output_path)
+        if parent and parent not in self._made_dirs:
+            os.makedirs(parent, exist_ok=True)
+            self._made_dirs.add(parent)
+        try:
+            with open(output_path, 'wb', buffering=0) as output_file:
+                for index, bundle_offset, length in self._pieces(member):
+                    if copy_range(self._fd(index), output_file.fileno(), bundle_offset, length) < length:
+                        raise ValueError(f"{os.path.basename(self.bundle_paths[index])} is shorter than expected")
+                if sync:
+                    os.fsync(output_file.fileno())
+        except BaseException:
+            os.remove(output_path)
+            raise
+        return output_path
+
+    def close(self) -> None:
+        if self._open_file:
+            self._open_file.close()
+        self._open_file = None
+        self._open_bundle = None
+
+@tracing.traced()
+def unpack_files(index_path: str, output_dir: str = None, delete_pack: bool = False, verify: bool = True,
+                 workers: int = 1, progress_callback: Callable[[dict], None] = None, durability: str = "none",
+                 cancel_event: threading.Event = None) -> int:
+    """Extracts every member of a pack under output_dir (by default the pack's own directory),
+    reading the bundles front to back. With verify, the bundles are checked against the index
+    first and any problem raises ValueError. durability works as in merge_files, per extracted
+    file; delete_pack implies at least "job", so the pack is only removed once its files are on disk.
+    Setting cancel_event stops before the next member with OperationCancelled; members already
+    extracted are complete and are kept. Returns the number of files written."""
+    check_durability(durability)
+    if delete_pack and durability == "none":
+        durability = "job"
+    with PackReader(index_path) as reader:
+        if verify:
+            problems = reader.verify(max(workers, 1))
+            if problems:
+                raise ValueError(f"Pack verification failed: {'; '.join(problems)}")
+        output_directory = output_dir or reader.directory
+        logger.info("Unpacking %d files from %s", len(reader.members()), index_path)
+
+        bundles = reader.index["bundles"]
+        metrics = TransferMetrics("unpack", index_path, reader.index["size"], len(bundles), progress_callback)
+        # Progress is reported per bundle; an event per member would swamp the callback
+        current = 0
+        started = time.perf_counter()
+        for member, offset, _ in reader.index["members"]:
+            bundle_index = reader.bundle_of(offset)
+            while current < bundle_index:
+                metrics.add_chunk(bundles[current]["name"], bundles[current]["size"], time.perf_counter() - started)
+                current, started = current + 1, time.perf_counter()
+            check_cancelled(cancel_event)
+            reader.extract(member, output_directory, durability == "chunk")
+        for bundle in bundles[current:]:
+            metrics.add_chunk(bundle["name"], bundle["size"], time.perf_counter() - started)
+            started = time.perf_counter()
+
+    if durability == "job":
+        run_tasks(fsync_path, [(_member_path(output_directory, member),) for member in reader.members()], workers)
+    if durability != "none":
+        # Every directory on the way to a member holds an entry that was just created
+        directories = {output_directory}
+        for member in reader.members():
+            parts = member.split("/")[:-1]
+            directories.update(os.path.join(output_directory, *parts[:depth]) for depth in range(1, len(parts) + 1))
+        for directory in sorted(directories, reverse=True):
+            fsync_directory(directory)
+
+    if delete_pack:
+        for path in reader.bundle_paths + [index_path]:
+            os.remove(path)
+
+    metrics.finish()
+    return len(reader.index["members"])
@@ -0,0 +1,134 @@
+"""Directory scanning behind find_large_files and find_chunk_groups.
+
+Every directory is read once with os.scandir and every file is stat'ed once. An
+optional JSON index remembers each directory's listing keyed by the directory's
+mtime, so rescanning an unchanged tree costs one stat per directory. A file rewritten
+in place doesn't change its directory's mtime, so its cached size is only refreshed
+once something is added, removed or renamed in that directory.
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import tracing
+
+PART_PATTERN = re.compile(r"_part(\d+)\.")  # chunk file names, e.g. Hero_part007.uasset
+PART_NUMBER_PATTERN = re.compile(r"_part(\d+)")
+TEMP_SUFFIX = ".tmp"  # files still being written; renamed into place when complete
+PACK_EXTENSION = ".chunkpack"  # bundles of small files, e.g. Content_part000.chunkpack; not split chunks
+
+def split_part_name(name: str) -> Optional[Tuple[str, int]]:
+    """Returns (prefix, part number) for a chunk file name, or None for any other file."""
+    match = PART_PATTERN.search(name)
+    if not match:
+        return None
+    return name[:match.start()], int(match.group(1))
+
+def part_number(path: str) -> int:
+    """Sort key for chunk paths: the number after _part in the file name."""
+    return int(PART_NUMBER_PATTERN.search(os.path.basename(path)).group(1))
+
+class ScanIndex:
+    """On-disk cache of directory listings, keyed by absolute path and directory mtime."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._dirs = {}
+        self._dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._dirs = json.load(f).get("dirs", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, directory: str, mtime_ns: int) -> Optional[Tuple[List[list], List[str]]]:
+        cached = self._dirs.get(directory)
+        if cached and cached["mtime_ns"] == mtime_ns:
+            return cached["files"], cached["subdirs"]
+        return None
+
+    def put(self, directory: str, mtime_ns: int, files: List[list], subdirs: List[str]) -> None:
+        self._dirs[directory] = {"mtime_ns": mtime_ns, "files": files, "subdirs": subdirs}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"dirs": self._dirs}, f)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+def _list_directory(path: str, with_sizes: bool = True) -> Tuple[List[list], List[str]]:
+    files, subdirs = [], []
+    with tracing.span("scandir", path=path) as span, os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                files.append([entry.name, entry.stat().st_size if with_sizes else None])
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+        span.set(files=len(files), subdirs=len(subdirs))
+    return files, subdirs
+
+def iter_listings(directory: str, recursive: bool = False, index_path: str = None,
+                  with_sizes: bool = True) -> Iterator[Tuple[str, List[list]]]:
+    """Yields (directory relative to the root, [[file name, size], ...]) for each directory scanned.
+    With index_path, listings of directories whose mtime hasn't changed come from the index.
+    Without with_sizes, files aren't stat'ed and sizes are None (unless they come from the index)."""
+    index = ScanIndex(index_path) if index_path else None
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        path = os.path.join(directory, relative_dir) if relative_dir else directory
+
+        listing = None
+        if index:
+            # Take the mtime before listing, so a change during the scan invalidates this entry
+            mtime_ns = os.stat(path).st_mtime_ns
+            listing = index.get(os.path.abspath(path), mtime_ns)
+        if listing is None:
+            # Indexed listings always carry sizes so they can serve any later scan
+            listing = _list_directory(path, with_sizes or index is not None)
+            if index:
+                index.put(os.path.abspath(path), mtime_ns, *listing)
+
+        files, subdirs = listing
+        yield relative_dir, files
+        if recursive:
+            pending.extend(os.path.join(relative_dir, name) if relative_dir else name for name in subdirs)
+
+    if index:
+        index.save()
+
+def scan_files(directory: str, recursive: bool = False, index_path: str = None) -> List[Tuple[str, int]]:
+    """Returns (path relative to directory, size) for every regular file, sorted by path."""
+    results = []
+    for relative_dir, files in iter_listings(directory, recursive, index_path):
+        if relative_dir:
+            results.extend((os.path.join(relative_dir, name), size) for name, size in files)
+        else:
+            results.extend((name, size) for name, size in files)
+    results.sort()
+    return results
+
+def group_chunks(listings: Iterable[Tuple[str, List[list]]]) -> Dict[str, List[str]]:
+    """Groups chunk paths by their prefix (keeping any subdirectory), each sorted by part number."""
+    groups = {}
+    for relative_dir, files in listings:
+        for name, _ in files:
+            # Cheap substring test first; the regex only runs on likely chunk names
+            match = (PART_PATTERN.search(name) if "_part" in name and not name.endswith((TEMP_SUFFIX, PACK_EXTENSION))
+                     else None)
+            if match:
+                groups.setdefault((relative_dir, name[:match.start()]), []).append((int(match.group(1)), name))
+
+    chunk_groups = {}
+    for relative_dir, prefix in sorted(groups):
+        parts = sorted(groups[relative_dir, prefix])
+        if relative_dir:
+            chunk_groups[os.path.join(relative_dir, prefix)] = [os.path.join(relative_dir, name) for _, name in parts]
+        else:
+            chunk_groups[prefix] = [name for _, name in parts]
+    return chunk_groups
@@ -0,0 +1,68 @@
+"""Runs the per-file jobs of an auto split or merge side by side.
+
+Jobs start largest first, so one huge asset doesn't end up running alone after
+everything else is done. Two limits apply at once: how many jobs run together, and how
+many bytes the running jobs cover in total, so a handful of multi-gigabyte files can't
+all hit the disk at the same time. A job bigger than the byte limit still runs, just
+on its own. Progress is the share of all bytes belonging to finished jobs.
+"""
+from typing import Callable, List, Optional
+
+from . import tracing
+
+DEFAULT_MAX_JOBS = 2  # files processed at once; each one may also use several workers
+DEFAULT_MAX_BYTES_IN_FLIGHT = 4 * 1024 * 1024 * 1024  # 4GB across all running jobs
+
+class Job:
+    """One file's worth of work: func(*args, **kwargs), weighted by the number of bytes it touches."""
+
+    def __init__(self, size: int, func: Callable, *args, **kwargs):
+        self.size = size
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+def run_jobs(jobs: List[Job], max_jobs: int = DEFAULT_MAX_JOBS, max_bytes: int = DEFAULT_MAX_BYTES_IN_FLIGHT,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> list:
+    """Runs every job and returns their results in the order given.
+    progress_callback(done_bytes, total_bytes) is called from this thread after each job.
+    After a failure no new jobs start; the running ones are waited for and the first error is raised."""
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    total_bytes = sum(job.size for job in jobs)
+    done_bytes = 0
+    pending = sorted(range(len(jobs)), key=lambda i: jobs[i].size, reverse=True)
+    results = [None] * len(jobs)
+    running = {}
+    bytes_in_flight = 0
+    error = None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_jobs)) as executor:
+        while (pending and error is None) or running:
+            # Start the largest jobs that fit; skip over ones that would exceed the byte budget
+            i = 0
+            while error is None and i < len(pending) and len(running) < max(1, max_jobs):
+                job = jobs[pending[i]]
+                if running and bytes_in_flight + job.size > max_bytes:
+                    i += 1
+                    continue
+                index = pending.pop(i)
+                running[executor.submit(tracing.profiled(job.func), *job.args, **job.kwargs)] = index
+                bytes_in_flight += job.size
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = running.pop(future)
+                bytes_in_flight -= jobs[index].size
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    if error is None:
+                        error = e
+                    continue
+                done_bytes += jobs[index].size
+                if progress_callback:
+                    progress_callback(done_bytes, total_bytes)
+
+    if error is not None:
+        raise error
+    return results
\ No newline at end of file
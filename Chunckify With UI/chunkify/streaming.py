@@ -0,0 +1,247 @@
+"""Splitting from and merging to byte streams such as stdin, stdout or pipes.
+
+Both directions are a short pipeline of generators over one reused buffer, so memory
+use is bounded by the buffer size whatever the stream length. A split writes each
+chunk as its bytes arrive and never needs the whole input on disk. Streams can't be
+rewound, so stream splits always use fixed-size chunks and can't be resumed.
+"""
+import os
+import time
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from . import chunk_codecs
+from . import scanner
+from . import tracing
+from .core import (FileProcessor, COPY_BUFFER_SIZE, CHUNK_SIZE, HASH_ALGORITHM, MANIFEST_SUFFIX, check_durability,
+                   fsync_directory, fsync_path, new_digest, read_into, root_hash, sparse_layout, temp_path,
+                   write_json_atomic)
+from .metrics import TransferMetrics
+
+def read_blocks(stream: BinaryIO, buffer_size: int = COPY_BUFFER_SIZE) -> Iterator[memoryview]:
+    """Yields the stream's bytes in blocks read into one reused buffer.
+    Each block is only valid until the next one is requested."""
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    readinto = getattr(stream, "readinto", None)
+    while True:
+        if readinto:
+            n = readinto(buffer)
+            block = view[:n or 0]
+        else:
+            block = memoryview(stream.read(buffer_size))
+        if not block:
+            return
+        yield block
+
+def cut_chunks(blocks: Iterator[memoryview], chunk_size: int) -> Iterator[Tuple[int, memoryview]]:
+    """Re-cuts blocks at chunk boundaries into (chunk index, piece); no piece spans two chunks."""
+    index = 0
+    filled = 0
+    for block in blocks:
+        while block:
+            piece = block[:chunk_size - filled]
+            yield index, piece
+            filled += len(piece)
+            block = block[len(piece):]
+            if filled == chunk_size:
+                index += 1
+                filled = 0
+
+def iter_chunk_data(chunk_paths: List[str], codec: "chunk_codecs.Codec" = None,
+                    buffer_size: int = COPY_BUFFER_SIZE,
+                    chunk_layouts: List[Optional[Tuple[int, list]]] = None) -> Iterator[Tuple[int, memoryview]]:
+    """Yields (chunk index, piece) for the contents of each chunk in order, decompressed if needed.
+    chunk_layouts gives (raw size, holes) for sparse chunks (None for others); their holes come out as zeros."""
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    zeros = memoryview(bytes(buffer_size))
+    for index, chunk_path in enumerate(chunk_paths):
+        layout = chunk_layouts[index] if chunk_layouts else None
+        with open(chunk_path, 'rb', buffering=0) as f:
+            if layout:
+                stored = 0
+                for _, size, is_hole in sparse_layout(*layout):
+                    done = 0
+                    while done < size:
+                        n = min(buffer_size, size - done)
+                        if is_hole:
+                            yield index, zeros[:n]
+                        else:
+                            n = read_into(f.fileno(), view[:n], stored + done)
+                            if n == 0:
+                                raise ValueError(f"{os.path.basename(chunk_path)} is shorter than its manifest says")
+                            yield index, view[:n]
+                        done += n
+                    if not is_hole:
+                        stored += size
+                continue
+            if codec:
+                for piece in codec.decompress(f, buffer_size):
+                    yield index, memoryview(piece)
+                continue
+            offset = 0
+            while True:
+                n = read_into(f.fileno(), view, offset)
+                if n == 0:
+                    break
+                yield index, view[:n]
+                offset += n
+
+class _ChunkWriter:
+    """Writes one chunk file from pieces, hashing (and compressing) them on the way.
+    The chunk is written under a temporary name and renamed into place by close()."""
+
+    def __init__(self, chunk_path: str, codec: "chunk_codecs.Codec", algorithm: str, sync: bool = False):
+        self.chunk_path = chunk_path
+        self.sync = sync
+        self.file = open(temp_path(chunk_path), 'wb', buffering=0)
+        self.compressor = codec.compressor() if codec else None
+        self.stored_digest = new_digest(algorithm)
+        self.raw_digest = new_digest(algorithm) if codec else None
+        self.raw_size = 0
+        self.stored_size = 0
+        self.started = time.perf_counter()
+
+    def _store(self, data) -> None:
+        self.stored_digest.update(data)
+        data = memoryview(data)
+        self.stored_size += len(data)
+        while data:
+            data = data[self.file.write(data):]
+
+    def write(self, piece: memoryview) -> None:
+        self.raw_size += len(piece)
+        if self.compressor:
+            self.raw_digest.update(piece)
+            self._store(self.compressor.compress(piece))
+        else:
+            self._store(piece)
+
+    def close(self) -> dict:
+        """Finishes the chunk and returns its manifest entry."""
+        if self.compressor:
+            self._store(self.compressor.flush())
+        if self.sync:
+            os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(temp_path(self.chunk_path), self.chunk_path)
+        entry = {"name": os.path.basename(self.chunk_path), "size": self.stored_size,
+                 "hash": self.stored_digest.hexdigest()}
+        if self.compressor:
+            entry.update(raw_size=self.raw_size, raw_hash=self.raw_digest.hexdigest())
+        return entry
+
+    def discard(self) -> None:
+        """Abandons an unfinished chunk, removing its temporary file."""
+        self.file.close()
+        try:
+            os.remove(temp_path(self.chunk_path))
+        except OSError:
+            pass
+
+@tracing.traced()
+def split_stream(stream: BinaryIO, file_name: str, chunk_size: int = CHUNK_SIZE, output_dir: str = ".",
+                 manifest: bool = True, codec: str = "none", buffer_size: int = COPY_BUFFER_SIZE,
+                 progress_callback: Callable[[dict], None] = None, durability: str = "none") -> int:
+    """Splits everything read from a binary stream into chunks named after file_name, as split_file would.
+    Chunks are written as data arrives; durability works as in split_file.
+    Returns the number of chunks created."""
+    chunk_codec = chunk_codecs.get_codec(codec)
+    check_durability(durability)
+    name, ext = os.path.splitext(file_name)
+    os.makedirs(output_dir, exist_ok=True)
+    metrics = TransferMetrics("split", file_name, None, None, progress_callback)
+
+    entries = []
+    writer = None
+
+    def finish_chunk():
+        entry = writer.close()
+        entries.append(entry)
+        metrics.add_chunk(entry["name"], writer.raw_size, time.perf_counter() - writer.started)
+
+    try:
+        for index, piece in cut_chunks(read_blocks(stream, buffer_size), chunk_size):
+            if index == len(entries) + 1:
+                finish_chunk()
+                writer = None
+            if writer is None:
+                writer = _ChunkWriter(os.path.join(output_dir, f"{name}_part{index:03d}{ext}"), chunk_codec,
+                                      HASH_ALGORITHM, durability == "chunk")
+            writer.write(piece)
+        if writer:
+            finish_chunk()
+            writer = None
+    finally:
+        if writer:
+            writer.discard()
+
+    if durability == "job":
+        for entry in entries:
+            fsync_path(os.path.join(output_dir, entry["name"]))
+
+    manifest_path = os.path.join(output_dir, f"{file_name}{MANIFEST_SUFFIX}")
+    if manifest:
+        manifest_data = {
+            "file_name": file_name,
+            "size": sum(entry.get("raw_size", entry["size"]) for entry in entries),
+            "chunk_size": chunk_size,
+            "content_defined": False,
+            "codec": codec or "none",
+            "algorithm": HASH_ALGORITHM,
+            "hash": root_hash([entry["hash"] for entry in entries]),
+            "chunks": entries,
+        }
+        write_json_atomic(manifest_path, manifest_data, durability != "none")
+    elif os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    if durability != "none":
+        fsync_directory(output_dir)
+
+    metrics.finish()
+    return len(entries)
+
+@tracing.traced()
+def merge_to_stream(chunk_paths: List[str], stream: BinaryIO, verify: bool = True, codec: str = None,
+                    buffer_size: int = COPY_BUFFER_SIZE, workers: int = 1,
+                    progress_callback: Callable[[dict], None] = None) -> int:
+    """Writes the file a chunk set was split from to a binary stream; returns the bytes written.
+    As in merge_files, a manifest is verified first and supplies the codec when there is one."""
+    chunk_paths = sorted(chunk_paths, key=scanner.part_number)
+    _, manifest = FileProcessor.load_manifest(chunk_paths, verify, workers)
+    if manifest:
+        codec = codec or manifest.get("codec")
+    chunk_codec = chunk_codecs.get_codec(codec)
+
+    bytes_total = manifest["size"] if manifest else None
+    if bytes_total is None and not chunk_codec:
+        bytes_total = sum(os.path.getsize(chunk_path) for chunk_path in chunk_paths)
+    label = chunk_paths[0] if chunk_paths else ""
+    metrics = TransferMetrics("merge", label, bytes_total, len(chunk_paths), progress_callback)
+    chunk_layouts = None
+    if manifest:
+        entries = {chunk["name"]: chunk for chunk in manifest["chunks"]}
+        chunk_layouts = []
+        for chunk_path in chunk_paths:
+            entry = entries.get(os.path.basename(chunk_path), {})
+            chunk_layouts.append((entry["raw_size"], entry["holes"]) if entry.get("holes") else None)
+
+    written = 0
+    chunk_written = 0
+    current = 0
+    started = time.perf_counter()
+    for index, piece in iter_chunk_data(chunk_paths, chunk_codec, buffer_size, chunk_layouts):
+        if index != current:
+            metrics.add_chunk(os.path.basename(chunk_paths[current]), chunk_written, time.perf_counter() - started)
+            current, chunk_written, started = index, 0, time.perf_counter()
+        written += len(piece)
+        chunk_written += len(piece)
+        while piece:
+            # Raw streams may accept only part of a write
+            piece = piece[stream.write(piece):]
+    if chunk_paths:
+        metrics.add_chunk(os.path.basename(chunk_paths[current]), chunk_written, time.perf_counter() - started)
+    stream.flush()
+
+    metrics.finish()
+    return written
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""Opt-in timing spans and profiling, for finding where a slow split or merge spends its time.
+
+Set CHUNKIFY_TRACE to a file name (or pass --trace to cli.py) and the spans recorded
+around each phase, chunk, read, write, hash and directory scan are written there as
+Chrome trace_event JSON when the process exits; open it in chrome://tracing or
+https://ui.perfetto.dev. CHUNKIFY_PROFILE (or --profile) also runs cProfile and writes
+its stats there, for python -m pstats or snakeviz. Before Python 3.12 cProfile only sees
+the threads it is started on, so each job and worker thread gets its own profile and
+they are added together at the end.
+
+When both are off, span() hands out one shared do-nothing context manager and profiled()
+returns the function it was given, so instrumented code pays a call and a global lookup.
+"""
+import atexit
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+TRACE_ENV = "CHUNKIFY_TRACE"  # file name for the Chrome trace
+PROFILE_ENV = "CHUNKIFY_PROFILE"  # file name for the cProfile stats
+
+logger = logging.getLogger(__name__)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """A running span; set() adds arguments only known once the work is done."""
+    __slots__ = ("recorder", "name", "args", "started")
+
+    def __init__(self, recorder: "TraceRecorder", name: str, args: dict):
+        self.recorder = recorder
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.recorder.add(self.name, self.started, time.perf_counter_ns(), self.args)
+        return False
+
+    def set(self, **args) -> None:
+        self.args.update(args)
+
+class TraceRecorder:
+    """Collects complete ("X") trace events from any thread and writes them as trace_event JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.events = []
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self._threads = {}  # thread id -> name, written as metadata so the viewer labels each row
+        self._lock = threading.Lock()
+
+    def add(self, name: str, started_ns: int, ended_ns: int, args: dict) -> None:
+        tid = threading.get_ident()
+        event = {"name": name, "ph": "X", "ts": (started_ns - self.origin) / 1000,
+                 "dur": (ended_ns - started_ns) / 1000, "pid": self.pid, "tid": tid}
+        if args:
+            event["args"] = args
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            self.events.append(event)
+
+    def save(self) -> None:
+        with self._lock:
+            events = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                      for tid, name in self._threads.items()]
+            events.extend(self.events)
+        temp = f"{self.path}.tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        os.replace(temp, self.path)
+
+class _Profiler:
+    """One cProfile.Profile per profiled thread, added together into a single stats file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.profiles = []
+        self._active = threading.local()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        # Nested calls on a profiled thread would switch its profile off on the way out
+        if getattr(self._active, "profile", None) is not None:
+            self._active.depth += 1
+            return self
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler, and it already sees every thread
+            profile = None
+        self._active.profile = profile
+        self._active.depth = 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._active.depth -= 1
+        if self._active.depth == 0:
+            profile, self._active.profile = self._active.profile, None
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self.profiles.append(profile)
+        return False
+
+    def save(self) -> None:
+        with self._lock:
+            profiles = list(self.profiles)
+        if not profiles:
+            return
+        import pstats
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(self.path)
+
+_recorder: Optional[TraceRecorder] = None
+_profiler: Optional[_Profiler] = None
+_registered = False
+
+def span(name: str, **args):
+    """Context manager timing the enclosed block as a span named name, with args shown in the viewer."""
+    if _recorder is None:
+        return _NULL_SPAN
+    return _Span(_recorder, name, args)
+
+def traced(name: str = None) -> Callable:
+    """Decorator recording every call of a function as a span (named after the function by default)."""
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with _Span(_recorder, label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def profiling():
+    """Context manager profiling the current thread while profiling is on; wrap thread entry points in it."""
+    return _profiler if _profiler is not None else _NULL_SPAN
+
+def profiled(func: Callable) -> Callable:
+    """Returns func wrapped to run under profiling(), for handing to a thread or pool;
+    func itself when profiling is off."""
+    if _profiler is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profiling():
+            return func(*args, **kwargs)
+    return wrapper
+
+def enabled() -> bool:
+    return _recorder is not None or _profiler is not None
+
+def start(trace_path: str = None, profile_path: str = None) -> None:
+    """Turns on tracing to trace_path and/or profiling to profile_path.
+    What was recorded is written by stop(), which also runs at exit."""
+    global _recorder, _profiler, _registered
+    # Absolute, so a front end changing directory later doesn't move the output
+    if trace_path and _recorder is None:
+        _recorder = TraceRecorder(os.path.abspath(trace_path))
+    if profile_path and _profiler is None:
+        _profiler = _Profiler(os.path.abspath(profile_path))
+    if enabled() and not _registered:
+        atexit.register(stop)
+        _registered = True
+
+def stop() -> None:
+    """Writes out the trace and profile and turns both off."""
+    global _recorder, _profiler
+    recorder, profiler = _recorder, _profiler
+    _recorder = _profiler = None
+    if recorder:
+        recorder.save()
+        logger.info("Trace written to %s (%d spans)", recorder.path, len(recorder.events))
+    if profiler:
+        profiler.save()
+        logger.info("Profile written to %s", profiler.path)
+
+start(os.environ.get(TRACE_ENV), os.environ.get(PROFILE_ENV))
\ No newline at end of file
@@ -0,0 +1,352 @@
+"""Command-line front end for batch splitting and merging, without the GUI or any prompts.
+
+    python cli.py split Hero.uasset Villain.uasset --chunk-size 50 --workers 4
+    python cli.py merge Hero.uasset "Hero_part*.uasset"
+    tar -xOf assets.tar Hero.uasset | python cli.py split - --name Hero.uasset
+    python cli.py merge - "Hero_part*.uasset" | gzip > Hero.uasset.gz
+    python cli.py auto split Content/ --recursive --jobs 4 --progress json
+    python cli.py verify Hero.uasset.manifest.json
+    python cli.py pack Content/ --recursive --chunk-size 64
+    python cli.py unpack Content/Content.chunkpack.json --output-dir Restored/
+    python cli.py scan Content/ --recursive
+    python cli.py run jobs.jsonl --jobs 8 --progress json
+    python cli.py split Hero.uasset --trace split.trace.json --profile split.prof
+
+A job file has one JSON object per line, such as {"op": "split", "file": "Hero.uasset"},
+{"op": "merge", "output": "Hero.uasset", "chunks": [...]}, {"op": "verify", "manifest": ...},
+{"op": "pack", "directory": ...} or {"op": "unpack", "index": ...};
+keys left out take their values from the command line. All operations of a run share
+one process and one scheduler, so a thousand of them cost no more startup than one.
+
+"-" as the file to split reads stdin, and "-" as the merge output writes stdout; progress
+then goes to stderr. With --progress json, stdout carries only JSON lines (chunk, summary,
+start, done and error events) and the usual messages go to stderr. A failed operation doesn't stop the
+others; the exit status is 1 if any failed.
+
+--trace writes timed spans of every phase, chunk and scan as Chrome trace JSON and --profile
+a cProfile dump (see tracing.py); the CHUNKIFY_TRACE and CHUNKIFY_PROFILE variables do the same.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import BinaryIO, List
+
+from chunkify import scanner, tracing
+from chunkify.core import FileProcessor, CHUNK_SIZE, DEFAULT_WORKERS, DURABILITY_LEVELS
+from chunkify.scheduler import Job, run_jobs, DEFAULT_MAX_JOBS
+
+MB = 1024 * 1024
+
+# Settings every operation reads; job file entries override them per line
+DEFAULTS = {
+    "chunk_size": CHUNK_SIZE // MB,  # MB
+    "output_dir": None,
+    "delete": False,
+    "workers": DEFAULT_WORKERS,
+    "manifest": True,
+    "verify": True,
+    "resume": False,
+    "update": False,
+    "sparse": False,
+    "content_defined": False,
+    "codec": None,
+    "durability": "none",
+    "name": "stdin.bin",  # file name used for chunks split from stdin
+}
+
+_log_handler = None
+
+def _configure_logging(stream, level: int) -> None:
+    """Sends the engine's log messages to stream, replacing the handler of an earlier run."""
+    global _log_handler
+    engine_logger = logging.getLogger("chunkify")
+    if _log_handler:
+        engine_logger.removeHandler(_log_handler)
+    _log_handler = logging.StreamHandler(stream)
+    _log_handler.setFormatter(logging.Formatter("%(message)s"))
+    engine_logger.addHandler(_log_handler)
+    engine_logger.setLevel(level)
+    engine_logger.propagate = False
+
+class Reporter:
+    """Writes operation events to stdout as JSON lines, as short text lines, or not at all."""
+
+    def __init__(self, mode: str, stream):
+        self.mode = mode
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event: dict) -> None:
+        if self.mode == "json":
+            line = json.dumps(event)
+        elif self.mode == "text" and event["event"] == "done":
+            line = f"✅ {event['op']} {event['target']}: {event['result']}"
+        elif self.mode == "text" and event["event"] == "error":
+            line = f"❌ {event['op']} {event['target']}: {event['error']}"
+        else:
+            return
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+def _target(op: dict) -> str:
+    return op.get("file") or op.get("output") or op.get("manifest") or op.get("directory") or op.get("index") or ""
+
+def _size(op: dict) -> int:
+    """Bytes an operation touches, used to schedule the largest first."""
+    try:
+        if op["op"] == "split":
+            return os.path.getsize(op["file"])
+        if op["op"] == "merge":
+            return sum(os.path.getsize(chunk) for chunk in op["chunks"])
+    except OSError:
+        pass
+    return 0
+
+def _delete(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def run_operation(op: dict, progress_callback=None, stdout: BinaryIO = None) -> str:
+    """Runs one split, merge or verify described by a job dict and returns a short result.
+    A split of "-" reads stdin; a merge to "-" writes to stdout (sys.stdout's buffer by default).
+    A relative merge output is placed under output_dir when one is set."""
+    settings = dict(DEFAULTS, **op)
+    # Streaming and packing code is only loaded by the operations that use it
+    if op["op"] == "split" and op["file"] == "-":
+        from chunkify import streaming
+        chunk_count = streaming.split_stream(
+            sys.stdin.buffer, settings["name"], int(settings["chunk_size"] * MB), settings["output_dir"] or ".",
+            settings["manifest"], settings["codec"] or "none", progress_callback=progress_callback,
+            durability=settings["durability"])
+        return f"{chunk_count} chunks"
+    if op["op"] == "merge" and op["output"] == "-":
+        from chunkify import streaming
+        written = streaming.merge_to_stream(list(op["chunks"]), stdout or sys.stdout.buffer, settings["verify"],
+                                            settings["codec"], workers=settings["workers"],
+                                            progress_callback=progress_callback)
+        if settings["delete"]:
+            manifest_path = FileProcessor.find_manifest(sorted(op["chunks"], key=scanner.part_number))
+            _delete(list(op["chunks"]) + ([manifest_path] if manifest_path else []))
+        return f"{written} bytes written to stdout"
+    if op["op"] == "split":
+        chunk_count = FileProcessor.split_file(
+            op["file"], int(settings["chunk_size"] * MB), settings["delete"], settings["output_dir"],
+            workers=settings["workers"], manifest=settings["manifest"], resume=settings["resume"],
+            content_defined=settings["content_defined"], codec=settings["codec"] or "none",
+            progress_callback=progress_callback, durability=settings["durability"], update=settings["update"],
+            sparse=settings["sparse"])
+        return f"{chunk_count} chunks"
+    if op["op"] == "merge":
+        output_path = os.path.join(settings["output_dir"] or "", op["output"])
+        FileProcessor.merge_files(output_path, list(op["chunks"]), settings["delete"], workers=settings["workers"],
+                                  verify=settings["verify"], resume=settings["resume"], codec=settings["codec"],
+                                  progress_callback=progress_callback, durability=settings["durability"])
+        return f"{len(op['chunks'])} chunks merged"
+    if op["op"] == "pack":
+        from chunkify import packing
+        index_path = packing.pack_files(
+            op["directory"], op.get("pack_name"), int(settings["chunk_size"] * MB), settings["output_dir"],
+            op.get("recursive", False), settings["delete"], settings["workers"], progress_callback,
+            settings["durability"], op.get("scan_index"))
+        return f"packed into {index_path}"
+    if op["op"] == "unpack":
+        from chunkify import packing
+        count = packing.unpack_files(op["index"], settings["output_dir"], settings["delete"], settings["verify"],
+                                     settings["workers"], progress_callback, settings["durability"])
+        return f"{count} files unpacked"
+    if op["op"] == "verify":
+        problems = FileProcessor.verify_chunks(op["manifest"], settings["workers"])
+        if problems:
+            raise ValueError("; ".join(problems))
+        return "all chunks match the manifest"
+    raise ValueError(f"Unknown operation: {op['op']}")
+
+def run_operations(ops: List[dict], max_jobs: int, reporter: Reporter, stdout: BinaryIO = None) -> int:
+    """Runs operations concurrently, largest first, and returns how many failed."""
+    started = time.perf_counter()
+    failed = []
+
+    def run_one(op):
+        base = {"op": op["op"], "target": _target(op)}
+        reporter.emit(dict(base, event="start"))
+        try:
+            with tracing.span(f"{op['op']} {base['target']}"):
+                result = run_operation(op, reporter.emit, stdout)
+        except Exception as e:
+            failed.append(op)
+            reporter.emit(dict(base, event="error", error=str(e)))
+        else:
+            reporter.emit(dict(base, event="done", result=result))
+
+    run_jobs([Job(_size(op), run_one, op) for op in ops], max_jobs)
+    reporter.emit({"event": "finished", "operations": len(ops), "failed": len(failed),
+                   "seconds": round(time.perf_counter() - started, 3)})
+    return len(failed)
+
+def _expand(patterns: List[str]) -> List[str]:
+    """Expands wildcards the shell left alone (as on Windows); other arguments pass through."""
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])
+    return paths
+
+def _settings(args) -> dict:
+    return {key: getattr(args, key) for key in DEFAULTS if getattr(args, key, None) is not None}
+
+def build_operations(args) -> List[dict]:
+    """Turns the parsed command line into a list of job dicts."""
+    settings = _settings(args)
+    if args.command == "split":
+        return [dict(settings, op="split", file=path) for path in _expand(args.files)]
+    if args.command == "merge":
+        return [dict(settings, op="merge", output=args.output, chunks=_expand(args.chunks))]
+    if args.command == "verify":
+        return [dict(settings, op="verify", manifest=path) for path in _expand(args.manifests)]
+    if args.command == "pack":
+        return [dict(settings, op="pack", directory=args.directory, pack_name=args.pack_name,
+                     recursive=args.recursive, scan_index=args.index)]
+    if args.command == "unpack":
+        return [dict(settings, op="unpack", index=path) for path in _expand(args.indexes)]
+    if args.command == "auto":
+        chunk_size = int(settings.get("chunk_size", DEFAULTS["chunk_size"]) * MB)
+        if args.mode == "split":
+            return [dict(settings, op="split", file=os.path.join(args.directory, path))
+                    for path in FileProcessor.find_large_files(args.directory, chunk_size, args.recursive, args.index)]
+        # The output already includes output_dir, so it is cleared to keep it from being applied twice
+        return [dict(settings, op="merge",
+                     output=FileProcessor.merge_output_path(args.directory, prefix, chunks, settings.get("output_dir")),
+                     output_dir=None, chunks=[os.path.join(args.directory, chunk) for chunk in chunks])
+                for prefix, chunks in FileProcessor.find_chunk_groups(args.directory, args.recursive,
+                                                                      args.index).items()]
+    if args.command == "run":
+        ops = []
+        with open(args.job_file, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                op = json.loads(line)
+                if op.get("op") not in ("split", "merge", "verify", "pack", "unpack"):
+                    raise ValueError(f"{args.job_file}:{line_number}: unknown op {op.get('op')!r}")
+                ops.append(dict(settings, **op))
+        return ops
+    raise ValueError(f"Unknown command: {args.command}")
+
+def scan(args, stream) -> None:
+    """Prints the large files and chunk groups in a directory as one JSON document."""
+    min_size = int(args.min_size * MB)
+    # One pass over the tree serves both lists
+    listings = list(scanner.iter_listings(args.directory, args.recursive, args.index))
+    large_files = []
+    for relative_dir, files in listings:
+        large_files.extend({"path": os.path.join(relative_dir, name), "size": size} for name, size in files
+                           if size > min_size and not scanner.PART_PATTERN.search(name))
+    large_files.sort(key=lambda file: file["path"])
+    json.dump({"large_files": large_files, "chunk_groups": scanner.group_chunks(listings)}, stream, indent=2)
+    stream.write("\n")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Split and merge large files without the GUI.")
+    # argparse.SUPPRESS keeps options the user didn't give out of the namespace, so job files can fill them
+    common = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    common.add_argument("--jobs", type=int, default=DEFAULT_MAX_JOBS,
+                        help=f"operations run at once (default {DEFAULT_MAX_JOBS})")
+    common.add_argument("--workers", type=int, help=f"threads per operation (default {DEFAULT_WORKERS})")
+    common.add_argument("--progress", choices=("text", "json", "none"), default="text",
+                        help="progress output on stdout (default text)")
+    common.add_argument("--output-dir", dest="output_dir", help="write chunks (or merged files) here")
+    common.add_argument("--chunk-size", dest="chunk_size", type=float,
+                        help=f"chunk size in MB (default {CHUNK_SIZE // MB})")
+    common.add_argument("--delete", action="store_true",
+                        help="delete originals after split or pack / chunks after merge / packs after unpack")
+    common.add_argument("--codec", help="chunk compression for split: none, zlib, lzma or zstd")
+    common.add_argument("--content-defined", dest="content_defined", action="store_true",
+                        help="content-defined chunk boundaries (chunk size is the average)")
+    common.add_argument("--no-manifest", dest="manifest", action="store_false", help="don't write a manifest")
+    common.add_argument("--no-verify", dest="verify", action="store_false", help="don't verify chunks before merging")
+    common.add_argument("--resume", action="store_true", help="resume interrupted operations")
+    common.add_argument("--update", action="store_true",
+                        help="split: rewrite only the chunks that changed since the last split")
+    common.add_argument("--sparse", action="store_true",
+                        help="split: leave holes and zero runs out of the chunks (merge recreates them as holes)")
+    common.add_argument("--durability", choices=DURABILITY_LEVELS,
+                        help="fsync written files never, once per operation, or after every chunk (default none)")
+    common.add_argument("--trace", help="write timed spans to this file as Chrome trace JSON")
+    common.add_argument("--profile", help="write cProfile stats to this file")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    split = commands.add_parser("split", parents=[common], help="split files into chunks")
+    split.add_argument("files", nargs="+", help='files to split, or "-" for stdin')
+    split.add_argument("--name", default=argparse.SUPPRESS, help="file name for chunks split from stdin")
+    merge = commands.add_parser("merge", parents=[common], help="merge chunks into one file")
+    merge.add_argument("output", help='merged file (under --output-dir if relative), or "-" for stdout')
+    merge.add_argument("chunks", nargs="+")
+    auto = commands.add_parser("auto", parents=[common], help="split large files or merge chunk groups in a directory")
+    auto.add_argument("mode", choices=("split", "merge"))
+    auto.add_argument("directory")
+    verify = commands.add_parser("verify", parents=[common], help="check chunks against their manifests")
+    verify.add_argument("manifests", nargs="+")
+    pack = commands.add_parser("pack", parents=[common],
+                               help="pack the files of a directory up to the chunk size into bundles")
+    pack.add_argument("directory")
+    pack.add_argument("--name", dest="pack_name", default=None, help="bundle name (default: the directory's name)")
+    unpack = commands.add_parser("unpack", parents=[common], help="extract the files of packs")
+    unpack.add_argument("indexes", nargs="+", help="pack indexes (*.chunkpack.json)")
+    run = commands.add_parser("run", parents=[common], help="run the operations listed in a JSON-lines job file")
+    run.add_argument("job_file")
+    scan_parser = commands.add_parser("scan", help="list large files and chunk groups as JSON")
+    scan_parser.add_argument("directory")
+    scan_parser.add_argument("--trace", help="write timed spans to this file as Chrome trace JSON")
+    scan_parser.add_argument("--profile", help="write cProfile stats to this file")
+    scan_parser.add_argument("--min-size", type=float, default=CHUNK_SIZE // MB,
+                             help=f"large file threshold in MB (default {CHUNK_SIZE // MB})")
+
+    for command in (auto, pack, scan_parser):
+        command.add_argument("--recursive", action="store_true", default=False, help="include subdirectories")
+        command.add_argument("--index", default=None, help="cache directory listings in this JSON file")
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    tracing.start(getattr(args, "trace", None), getattr(args, "profile", None))
+    with tracing.profiling():
+        return run_command(args)
+
+def run_command(args) -> int:
+    """Runs the parsed command line and returns the exit status."""
+    stdout = sys.stdout
+    if args.command == "scan":
+        _configure_logging(sys.stderr, logging.INFO)
+        scan(args, stdout)
+        return 0
+
+    try:
+        ops = build_operations(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    # Merged data written to stdout must not be mixed with progress or messages
+    to_stdout = any(op["op"] == "merge" and op["output"] == "-" for op in ops)
+    reporter = Reporter(args.progress, sys.stderr if to_stdout else stdout)
+    # Keep stdout for events; the engine's own messages go to stderr (only warnings without progress)
+    if args.progress == "none":
+        _configure_logging(sys.stderr, logging.WARNING)
+    elif args.progress == "json" or to_stdout:
+        _configure_logging(sys.stderr, logging.INFO)
+    else:
+        _configure_logging(stdout, logging.INFO)
+    failed = run_operations(ops, args.jobs, reporter, stdout.buffer)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,8 +1,19 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from ui import FileSplitterUI
 
 def main():
+    if len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+        # "main.py split Hero.uasset" and friends go to the CLI without loading PyQt5; Qt's own options start with "-"
+        import cli
+        sys.exit(cli.main())
+    
+    import logging
+    from PyQt5.QtWidgets import QApplication
+    from ui import FileSplitterUI
+    from chunkify import tracing
+    
+    # The engine's status lines and warnings go to the console the window was started from
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     app = QApplication(sys.argv)
     
     # Set application metadata
@@ -13,7 +24,9 @@ def main():
     window = FileSplitterUI()
     window.show()
     
-    sys.exit(app.exec_())
+    with tracing.profiling():
+        status = app.exec_()
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,57 +1,177 @@
 import os
+import threading
+import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QFileDialog, QListWidget, QMessageBox,
+                             QLabel, QPushButton, QFileDialog, QListView, QMessageBox,
                              QTabWidget, QProgressBar, QLineEdit, QSpinBox, QGroupBox,
-                             QCheckBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                             QCheckBox, QComboBox, QTableWidget, QTableWidgetItem, QHeaderView, QInputDialog)
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
-from core import FileProcessor, CHUNK_SIZE
+from chunkify import tracing
+from chunkify.core import (FileProcessor, CHUNK_SIZE, DEFAULT_WORKERS, DURABILITY_LEVELS, OperationCancelled,
+                           check_cancelled)
+from chunkify.chunk_store import ChunkStore, RECIPE_SUFFIX
+from chunkify.chunk_codecs import available_codecs
+from chunkify.packing import find_packs, pack_files, unpack_files
+from chunkify.scheduler import Job, run_jobs, DEFAULT_MAX_JOBS
+from chunk_list import ChunkListModel, ChunkLoader
 
-class WorkerThread(QThread):
+class JobSignals(QObject):
+    job_started = pyqtSignal()
     progress_updated = pyqtSignal(int)
     operation_completed = pyqtSignal(str, bool)
+
+class WorkerJob(QRunnable):
+    """One queued operation, run on the window's QThreadPool.
+    QRunnable isn't a QObject, so its signals live on a JobSignals. cancel() stops
+    splits and merges at the next chunk boundary, and other operations before their next file."""
     
     def __init__(self, operation, *args, **kwargs):
         super().__init__()
+        self.setAutoDelete(False)  # the window keeps it for its row
+        self.signals = JobSignals()
+        self.cancel_event = threading.Event()
         self.operation = operation
         self.args = args
         self.kwargs = kwargs
+        self.job_sizes = {}  # file -> its weight in overall progress, for auto operations
+        self.job_fractions = {}
+        self.summaries = []
+        self.started = None
+        self._lock = threading.Lock()
+    
+    def cancel(self):
+        self.cancel_event.set()
+    
+    def cancellable(self, func):
+        """Wraps func so that, once the job is cancelled, it raises instead of starting."""
+        def run(*args, **kwargs):
+            check_cancelled(self.cancel_event)
+            return func(*args, **kwargs)
+        return run
+    
+    def emit_progress(self, done_bytes, total_bytes):
+        self.signals.progress_updated.emit(done_bytes * 100 // total_bytes if total_bytes else 100)
+    
+    def on_metrics(self, event):
+        """Turns chunk events from any running job into overall progress and keeps job summaries."""
+        with self._lock:
+            if event["event"] == "summary":
+                self.summaries.append(event)
+                return
+            if not self.job_sizes:
+                self.emit_progress(event["bytes_done"], event["bytes_total"])
+                return
+            self.job_fractions[event["file"]] = event["bytes_done"] / event["bytes_total"] if event["bytes_total"] else 1
+            done = sum(fraction * self.job_sizes.get(file, 0) for file, fraction in self.job_fractions.items())
+            self.emit_progress(int(done), sum(self.job_sizes.values()))
+    
+    def throughput(self):
+        """Summarizes the finished jobs, e.g. " (512 MB in 3.2s, 160.0 MB/s)"."""
+        if not self.summaries:
+            return ""
+        total_bytes = sum(summary["bytes_total"] for summary in self.summaries)
+        elapsed = time.perf_counter() - self.started
+        rate = total_bytes / elapsed / (1024 * 1024) if elapsed else 0.0
+        return f" ({total_bytes // (1024 * 1024)} MB in {elapsed:.1f}s, {rate:.1f} MB/s)"
     
     def run(self):
+        # Pool threads aren't seen by a profiler started elsewhere, so each job profiles itself
+        with tracing.profiling(), tracing.span(f"job {self.operation}", args=repr(self.args)):
+            self.run_operation()
+    
+    def run_operation(self):
+        self.started = time.perf_counter()
+        self.signals.job_started.emit()
         try:
             if self.operation == "split":
                 file_path, chunk_size, delete_original, output_dir = self.args
-                chunk_count = FileProcessor.split_file(file_path, chunk_size, delete_original, output_dir)
-                self.operation_completed.emit(f"File split into {chunk_count} parts.", True)
+                chunk_count = FileProcessor.split_file(file_path, chunk_size, delete_original, output_dir,
+                                                       progress_callback=self.on_metrics, cancel_event=self.cancel_event,
+                                                       **self.kwargs)
+                self.signals.operation_completed.emit(f"File split into {chunk_count} parts{self.throughput()}.", True)
             elif self.operation == "merge":
                 output_path, chunk_paths, delete_chunks = self.args
-                FileProcessor.merge_files(output_path, chunk_paths, delete_chunks)
-                self.operation_completed.emit(f"Files merged successfully into {output_path}.", True)
+                FileProcessor.merge_files(output_path, chunk_paths, delete_chunks, progress_callback=self.on_metrics,
+                                          cancel_event=self.cancel_event, **self.kwargs)
+                self.signals.operation_completed.emit(f"Files merged successfully into {output_path}{self.throughput()}.", True)
+            elif self.operation == "verify":
+                manifest_path, workers = self.args
+                problems = FileProcessor.verify_chunks(manifest_path, workers)
+                if problems:
+                    self.signals.operation_completed.emit("Verification failed:\n" + "\n".join(problems), False)
+                else:
+                    self.signals.operation_completed.emit("All chunks match the manifest.", True)
             elif self.operation == "auto_split":
-                directory, chunk_size, delete_original, output_dir = self.args
-                large_files = FileProcessor.find_large_files(directory, chunk_size)
-                for i, file in enumerate(large_files):
-                    self.progress_updated.emit((i + 1) * 100 // len(large_files))
-                    FileProcessor.split_file(os.path.join(directory, file), chunk_size, delete_original, output_dir)
-                self.operation_completed.emit(f"Processed {len(large_files)} large files.", True)
+                directory, chunk_size, delete_original, output_dir, recursive, max_jobs = self.args
+                large_files = FileProcessor.find_large_files(directory, chunk_size, recursive)
+                jobs = []
+                for file in large_files:
+                    file_path = os.path.join(directory, file)
+                    self.job_sizes[file_path] = os.path.getsize(file_path)
+                    jobs.append(Job(self.job_sizes[file_path], FileProcessor.split_file, file_path, chunk_size,
+                                    delete_original, output_dir, progress_callback=self.on_metrics,
+                                    cancel_event=self.cancel_event, **self.kwargs))
+                run_jobs(jobs, max_jobs)
+                self.signals.operation_completed.emit(f"Processed {len(large_files)} large files{self.throughput()}.", True)
             elif self.operation == "auto_merge":
-                directory, delete_chunks, output_dir = self.args
-                file_groups = FileProcessor.find_chunk_groups(directory)
-                for i, (prefix, chunks) in enumerate(file_groups.items()):
-                    self.progress_updated.emit((i + 1) * 100 // len(file_groups))
-                    output_path = f"{prefix}{os.path.splitext(chunks[0])[1]}"
+                directory, delete_chunks, output_dir, recursive, max_jobs = self.args
+                file_groups = FileProcessor.find_chunk_groups(directory, recursive)
+                jobs = []
+                for prefix, chunks in file_groups.items():
+                    output_path = FileProcessor.merge_output_path(directory, prefix, chunks, output_dir)
+                    chunk_paths = [os.path.join(directory, c) for c in chunks]
+                    self.job_sizes[output_path] = sum(os.path.getsize(c) for c in chunk_paths)
+                    jobs.append(Job(self.job_sizes[output_path], FileProcessor.merge_files, output_path, chunk_paths,
+                                    delete_chunks, progress_callback=self.on_metrics, cancel_event=self.cancel_event,
+                                    **self.kwargs))
+                run_jobs(jobs, max_jobs)
+                self.signals.operation_completed.emit(f"Merged {len(file_groups)} file groups{self.throughput()}.", True)
+            elif self.operation == "auto_store":
+                directory, chunk_size, delete_original, output_dir, recursive, max_jobs, store_dir = self.args
+                store = ChunkStore(store_dir)
+                large_files = FileProcessor.find_large_files(directory, chunk_size, recursive)
+                jobs = []
+                for file in large_files:
+                    file_path = os.path.join(directory, file)
+                    jobs.append(Job(os.path.getsize(file_path), self.cancellable(store.store_file), file_path, chunk_size,
+                                    delete_original, output_dir, **self.kwargs))
+                run_jobs(jobs, max_jobs, progress_callback=self.emit_progress)
+                self.signals.operation_completed.emit(
+                    f"Stored {len(large_files)} large files "
+                    f"({store.bytes_written // (1024 * 1024)} MB new, "
+                    f"{store.bytes_deduplicated // (1024 * 1024)} MB deduplicated).", True)
+            elif self.operation == "auto_restore":
+                directory, delete_recipes, output_dir, recursive, store_dir = self.args
+                store = ChunkStore(store_dir)
+                recipes = ChunkStore.find_recipes(directory, recursive)
+                for i, recipe in enumerate(recipes):
+                    check_cancelled(self.cancel_event)
+                    self.signals.progress_updated.emit((i + 1) * 100 // len(recipes))
+                    output_path = None
                     if output_dir:
-                        output_path = os.path.join(output_dir, os.path.basename(output_path))
-                    else:
-                        output_path = os.path.join(directory, output_path)
-                    FileProcessor.merge_files(
-                        output_path, 
-                        [os.path.join(directory, c) for c in chunks], 
-                        delete_chunks
-                    )
-                self.operation_completed.emit(f"Merged {len(file_groups)} file groups.", True)
+                        output_path = os.path.join(output_dir, os.path.basename(recipe)[:-len(RECIPE_SUFFIX)])
+                    store.restore_file(os.path.join(directory, recipe), output_path, delete_recipes, **self.kwargs)
+                self.signals.operation_completed.emit(f"Restored {len(recipes)} files from the chunk store.", True)
+            elif self.operation == "auto_pack":
+                directory, chunk_size, delete_original, output_dir, recursive = self.args
+                index_path = pack_files(directory, None, chunk_size, output_dir, recursive, delete_original,
+                                        progress_callback=self.on_metrics, cancel_event=self.cancel_event,
+                                        **self.kwargs)
+                self.signals.operation_completed.emit(f"Packed small files into {index_path}{self.throughput()}.", True)
+            elif self.operation == "auto_unpack":
+                directory, delete_packs, output_dir, recursive = self.args
+                packs = find_packs(directory, recursive)
+                count = 0
+                for i, pack in enumerate(packs):
+                    count += unpack_files(os.path.join(directory, pack), output_dir, delete_packs,
+                                          cancel_event=self.cancel_event, **self.kwargs)
+                    self.signals.progress_updated.emit((i + 1) * 100 // len(packs))
+                self.signals.operation_completed.emit(f"Unpacked {count} files from {len(packs)} packs.", True)
+        except OperationCancelled:
+            self.signals.operation_completed.emit("Cancelled.", False)
         except Exception as e:
-            self.operation_completed.emit(f"Error: {str(e)}", False)
+            self.signals.operation_completed.emit(f"Error: {str(e)}", False)
 
 class FileSplitterUI(QMainWindow):
     def __init__(self):
@@ -70,16 +190,20 @@ class FileSplitterUI(QMainWindow):
         self.main_layout.addWidget(self.tabs)
         
         # Add tabs
+        self.chunk_loader = None
+        self.retired_loaders = set()  # cancelled loaders, kept alive until their threads exit
         self.create_split_tab()
         self.create_merge_tab()
         self.create_auto_tab()
         
+        # Job queue: operations run on a thread pool, each with its own row
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(DEFAULT_MAX_JOBS)
+        self.jobs = []  # [job, row items and widgets] in queue order
+        self.create_jobs_panel()
+        
         # Status bar
         self.status_bar = self.statusBar()
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setMaximumWidth(200)
-        self.progress_bar.setVisible(False)
-        self.status_bar.addPermanentWidget(self.progress_bar)
         
         # Set style
         self.set_style()
@@ -132,7 +256,7 @@ class FileSplitterUI(QMainWindow):
             QPushButton:disabled {
                 background: #cccccc;
             }
-            QListWidget {
+            QListView {
                 border: 1px solid #ccc;
                 border-radius: 4px;
                 background: white;
@@ -152,6 +276,39 @@ class FileSplitterUI(QMainWindow):
         font.setPointSize(10)
         self.setFont(font)
     
+    def create_jobs_panel(self):
+        jobs_group = QGroupBox("Jobs")
+        jobs_layout = QVBoxLayout(jobs_group)
+        
+        self.jobs_table = QTableWidget(0, 4)
+        self.jobs_table.setHorizontalHeaderLabels(["Job", "Status", "Progress", ""])
+        self.jobs_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.jobs_table.setSelectionMode(QTableWidget.NoSelection)
+        self.jobs_table.setMaximumHeight(180)
+        jobs_layout.addWidget(self.jobs_table)
+        
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Concurrent Jobs:"))
+        self.concurrent_jobs = QSpinBox()
+        self.concurrent_jobs.setRange(1, 16)
+        self.concurrent_jobs.setValue(self.pool.maxThreadCount())
+        self.concurrent_jobs.valueChanged.connect(self.pool.setMaxThreadCount)
+        controls_layout.addWidget(self.concurrent_jobs)
+        controls_layout.addStretch()
+        
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self.clear_finished_jobs)
+        controls_layout.addWidget(clear_btn)
+        
+        cancel_all_btn = QPushButton("Cancel All")
+        cancel_all_btn.clicked.connect(self.cancel_all_jobs)
+        controls_layout.addWidget(cancel_all_btn)
+        jobs_layout.addLayout(controls_layout)
+        
+        self.main_layout.addWidget(jobs_group)
+    
     def create_split_tab(self):
         tab = QWidget()
         layout = QVBoxLayout(tab)
@@ -193,10 +350,51 @@ class FileSplitterUI(QMainWindow):
         size_layout.addStretch()
         chunk_layout.addLayout(size_layout)
         
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Workers:"))
+        self.split_workers = QSpinBox()
+        self.split_workers.setRange(1, 64)
+        self.split_workers.setValue(DEFAULT_WORKERS)
+        workers_layout.addWidget(self.split_workers)
+        workers_layout.addStretch()
+        chunk_layout.addLayout(workers_layout)
+        
+        codec_layout = QHBoxLayout()
+        codec_layout.addWidget(QLabel("Compression:"))
+        self.split_codec = QComboBox()
+        self.split_codec.addItems(available_codecs())
+        codec_layout.addWidget(self.split_codec)
+        codec_layout.addStretch()
+        chunk_layout.addLayout(codec_layout)
+        
+        durability_layout = QHBoxLayout()
+        durability_layout.addWidget(QLabel("Durability:"))
+        self.split_durability = QComboBox()
+        self.split_durability.addItems(DURABILITY_LEVELS)
+        durability_layout.addWidget(self.split_durability)
+        durability_layout.addStretch()
+        chunk_layout.addLayout(durability_layout)
+        
+        # Content-defined chunking checkbox
+        self.content_defined_split = QCheckBox("Content-defined boundaries (chunk size is the average)")
+        chunk_layout.addWidget(self.content_defined_split)
+        
         # Delete original checkbox
         self.delete_after_split = QCheckBox("Delete original file after splitting")
         chunk_layout.addWidget(self.delete_after_split)
         
+        # Resume checkbox
+        self.resume_split = QCheckBox("Resume an interrupted split")
+        chunk_layout.addWidget(self.resume_split)
+        
+        # Update checkbox
+        self.update_split = QCheckBox("Update an earlier split (rewrite only changed chunks)")
+        chunk_layout.addWidget(self.update_split)
+        
+        # Sparse checkbox
+        self.sparse_split = QCheckBox("Sparse (leave holes and zero runs out of the chunks)")
+        chunk_layout.addWidget(self.sparse_split)
+        
         # Action button
         split_btn = QPushButton("Split File")
         split_btn.clicked.connect(self.start_split)
@@ -237,26 +435,63 @@ class FileSplitterUI(QMainWindow):
         chunks_group = QGroupBox("Chunks to Merge")
         chunks_layout = QVBoxLayout(chunks_group)
         
-        self.chunks_list = QListWidget()
-        self.chunks_list.setSelectionMode(QListWidget.MultiSelection)
+        # Paths live in a model and are loaded off the GUI thread, so huge chunk sets don't freeze the window
+        self.chunks_model = ChunkListModel(self)
+        self.chunks_list = QListView()
+        self.chunks_list.setModel(self.chunks_model)
+        self.chunks_list.setUniformItemSizes(True)
+        self.chunks_list.setSelectionMode(QListView.MultiSelection)
         chunks_layout.addWidget(self.chunks_list)
         
+        add_layout = QHBoxLayout()
         add_chunks_btn = QPushButton("Add Chunks...")
         add_chunks_btn.clicked.connect(self.browse_chunks)
-        chunks_layout.addWidget(add_chunks_btn)
+        add_layout.addWidget(add_chunks_btn)
+        add_folder_btn = QPushButton("Add Folder...")
+        add_folder_btn.clicked.connect(self.browse_chunk_folder)
+        add_layout.addWidget(add_folder_btn)
+        chunks_layout.addLayout(add_layout)
+        
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Workers:"))
+        self.merge_workers = QSpinBox()
+        self.merge_workers.setRange(1, 64)
+        self.merge_workers.setValue(DEFAULT_WORKERS)
+        workers_layout.addWidget(self.merge_workers)
+        workers_layout.addStretch()
+        chunks_layout.addLayout(workers_layout)
+        
+        durability_layout = QHBoxLayout()
+        durability_layout.addWidget(QLabel("Durability:"))
+        self.merge_durability = QComboBox()
+        self.merge_durability.addItems(DURABILITY_LEVELS)
+        durability_layout.addWidget(self.merge_durability)
+        durability_layout.addStretch()
+        chunks_layout.addLayout(durability_layout)
         
         # Delete chunks checkbox
         self.delete_after_merge = QCheckBox("Delete chunk files after merging")
         chunks_layout.addWidget(self.delete_after_merge)
         
-        # Action button
+        # Resume checkbox
+        self.resume_merge = QCheckBox("Resume an interrupted merge")
+        chunks_layout.addWidget(self.resume_merge)
+        
+        # Action buttons
+        verify_btn = QPushButton("Verify Chunks")
+        verify_btn.clicked.connect(self.start_verify)
+        
         merge_btn = QPushButton("Merge Files")
         merge_btn.clicked.connect(self.start_merge)
         
+        btn_layout = QHBoxLayout()
+        btn_layout.addWidget(verify_btn)
+        btn_layout.addWidget(merge_btn)
+        
         layout.addWidget(output_group)
         layout.addWidget(merge_output_dir_group)
         layout.addWidget(chunks_group)
-        layout.addWidget(merge_btn)
+        layout.addLayout(btn_layout)
         layout.addStretch()
         
         self.tabs.addTab(tab, "Merge Files")
@@ -277,6 +512,9 @@ class FileSplitterUI(QMainWindow):
         browse_dir_btn.clicked.connect(self.browse_directory)
         dir_layout.addWidget(browse_dir_btn)
         
+        self.auto_recursive = QCheckBox("Include subdirectories")
+        dir_layout.addWidget(self.auto_recursive)
+        
         # Output directory
         auto_output_dir_group = QGroupBox("Output Directory")
         auto_output_dir_layout = QVBoxLayout(auto_output_dir_group)
@@ -289,6 +527,18 @@ class FileSplitterUI(QMainWindow):
         browse_auto_output_btn.clicked.connect(lambda: self.browse_output_directory(self.auto_output_dir))
         auto_output_dir_layout.addWidget(browse_auto_output_btn)
         
+        # Chunk store
+        store_group = QGroupBox("Chunk Store")
+        store_layout = QVBoxLayout(store_group)
+        
+        self.auto_store_dir = QLineEdit()
+        self.auto_store_dir.setPlaceholderText("(Optional) Deduplicate chunks into a shared store directory...")
+        store_layout.addWidget(self.auto_store_dir)
+        
+        browse_store_btn = QPushButton("Browse...")
+        browse_store_btn.clicked.connect(lambda: self.browse_output_directory(self.auto_store_dir))
+        store_layout.addWidget(browse_store_btn)
+        
         # Chunk size for auto-split
         auto_chunk_group = QGroupBox("Auto Split Settings")
         auto_chunk_layout = QVBoxLayout(auto_chunk_group)
@@ -302,6 +552,44 @@ class FileSplitterUI(QMainWindow):
         size_layout.addStretch()
         auto_chunk_layout.addLayout(size_layout)
         
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Workers:"))
+        self.auto_workers = QSpinBox()
+        self.auto_workers.setRange(1, 64)
+        self.auto_workers.setValue(DEFAULT_WORKERS)
+        workers_layout.addWidget(self.auto_workers)
+        workers_layout.addStretch()
+        auto_chunk_layout.addLayout(workers_layout)
+        
+        jobs_layout = QHBoxLayout()
+        jobs_layout.addWidget(QLabel("Parallel Files:"))
+        self.auto_max_jobs = QSpinBox()
+        self.auto_max_jobs.setRange(1, 16)
+        self.auto_max_jobs.setValue(DEFAULT_MAX_JOBS)
+        jobs_layout.addWidget(self.auto_max_jobs)
+        jobs_layout.addStretch()
+        auto_chunk_layout.addLayout(jobs_layout)
+        
+        codec_layout = QHBoxLayout()
+        codec_layout.addWidget(QLabel("Compression:"))
+        self.auto_codec = QComboBox()
+        self.auto_codec.addItems(available_codecs())
+        codec_layout.addWidget(self.auto_codec)
+        codec_layout.addStretch()
+        auto_chunk_layout.addLayout(codec_layout)
+        
+        durability_layout = QHBoxLayout()
+        durability_layout.addWidget(QLabel("Durability:"))
+        self.auto_durability = QComboBox()
+        self.auto_durability.addItems(DURABILITY_LEVELS)
+        durability_layout.addWidget(self.auto_durability)
+        durability_layout.addStretch()
+        auto_chunk_layout.addLayout(durability_layout)
+        
+        # Content-defined chunking checkbox
+        self.auto_content_defined = QCheckBox("Content-defined boundaries (chunk size is the average)")
+        auto_chunk_layout.addWidget(self.auto_content_defined)
+        
         # Delete original checkbox
         self.auto_delete_after_split = QCheckBox("Delete original files after splitting")
         auto_chunk_layout.addWidget(self.auto_delete_after_split)
@@ -310,6 +598,18 @@ class FileSplitterUI(QMainWindow):
         self.auto_delete_after_merge = QCheckBox("Delete chunk files after merging")
         auto_chunk_layout.addWidget(self.auto_delete_after_merge)
         
+        # Resume checkbox
+        self.auto_resume = QCheckBox("Resume interrupted operations")
+        auto_chunk_layout.addWidget(self.auto_resume)
+        
+        # Update checkbox
+        self.auto_update = QCheckBox("Update earlier splits (rewrite only changed chunks)")
+        auto_chunk_layout.addWidget(self.auto_update)
+        
+        # Sparse checkbox
+        self.auto_sparse = QCheckBox("Sparse (leave holes and zero runs out of the chunks)")
+        auto_chunk_layout.addWidget(self.auto_sparse)
+        
         # Action buttons
         auto_split_btn = QPushButton("Auto Split Large Files")
         auto_split_btn.clicked.connect(self.start_auto_split)
@@ -317,12 +617,21 @@ class FileSplitterUI(QMainWindow):
         auto_merge_btn = QPushButton("Auto Merge Chunks")
         auto_merge_btn.clicked.connect(self.start_auto_merge)
         
+        pack_btn = QPushButton("Pack Small Files")
+        pack_btn.clicked.connect(self.start_auto_pack)
+        
+        unpack_btn = QPushButton("Unpack Packs")
+        unpack_btn.clicked.connect(self.start_auto_unpack)
+        
         btn_layout = QHBoxLayout()
         btn_layout.addWidget(auto_split_btn)
         btn_layout.addWidget(auto_merge_btn)
+        btn_layout.addWidget(pack_btn)
+        btn_layout.addWidget(unpack_btn)
         
         layout.addWidget(dir_group)
         layout.addWidget(auto_output_dir_group)
+        layout.addWidget(store_group)
         layout.addWidget(auto_chunk_group)
         layout.addLayout(btn_layout)
         layout.addStretch()
@@ -337,9 +646,60 @@ class FileSplitterUI(QMainWindow):
     def browse_chunks(self):
         file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Chunk Files")
         if file_paths:
-            self.chunks_list.clear()
-            for path in file_paths:
-                self.chunks_list.addItem(path)
+            self.load_chunks(ChunkLoader(paths=file_paths))
+    
+    def browse_chunk_folder(self):
+        dir_path = QFileDialog.getExistingDirectory(self, "Select Folder of Chunks")
+        if dir_path:
+            self.load_chunks(ChunkLoader(directory=dir_path))
+    
+    def load_chunks(self, loader):
+        """Replaces the chunk list with what loader finds; rows appear as its batches arrive."""
+        old_loader = self.chunk_loader
+        if old_loader and old_loader.isRunning():
+            old_loader.cancel()
+            self.retired_loaders.add(old_loader)
+            old_loader.finished.connect(lambda: self.retired_loaders.discard(old_loader))
+        self.chunks_model.clear()
+        self.chunk_loader = loader
+        loader.batch_loaded.connect(self.chunks_loaded)
+        loader.loading_finished.connect(self.chunks_loading_finished)
+        loader.loading_failed.connect(self.chunks_loading_failed)
+        loader.groups_found.connect(self.choose_chunk_group)
+        self.status_bar.showMessage("Loading chunks...")
+        loader.start()
+    
+    def chunks_loaded(self, paths):
+        # Batches from a loader that has since been replaced are dropped
+        if self.sender() is self.chunk_loader:
+            self.chunks_model.append_paths(paths)
+    
+    def chunks_loading_finished(self, count):
+        if self.sender() is self.chunk_loader:
+            self.status_bar.showMessage(f"Loaded {count} chunks")
+    
+    def choose_chunk_group(self, groups):
+        """Asks which of the chunk groups found in a folder to load, since a merge rebuilds only one file."""
+        if self.sender() is not self.chunk_loader:
+            return
+        self.status_bar.clearMessage()
+        prefix, ok = QInputDialog.getItem(self, "Select Chunk Group",
+                                          f"The folder holds {len(groups)} chunked files. Which one should be merged?",
+                                          sorted(groups), 0, False)
+        if ok:
+            self.load_chunks(ChunkLoader(paths=groups[prefix]))
+    
+    def chunks_loading_failed(self, message):
+        if self.sender() is self.chunk_loader:
+            self.status_bar.clearMessage()
+            QMessageBox.critical(self, "Error", f"Failed to load chunks: {message}")
+    
+    def selected_chunks(self):
+        """Returns every chunk path in the list, or None (after warning) while it is still loading."""
+        if self.chunk_loader and self.chunk_loader.isRunning():
+            QMessageBox.warning(self, "Warning", "Chunks are still loading, please wait.")
+            return None
+        return self.chunks_model.paths()
     
     def browse_directory(self):
         dir_path = QFileDialog.getExistingDirectory(self, "Select Directory")
@@ -361,10 +721,18 @@ class FileSplitterUI(QMainWindow):
         delete_original = self.delete_after_split.isChecked()
         output_dir = self.split_output_dir.text() or None
         
-        self.worker = WorkerThread("split", file_path, chunk_size, delete_original, output_dir)
-        self.set_worker_connections(self.worker)
-        self.worker.start()
-        self.show_progress(True)
+        workers = self.split_workers.value()
+        resume = self.resume_split.isChecked()
+        content_defined = self.content_defined_split.isChecked()
+        codec = self.split_codec.currentText()
+        durability = self.split_durability.currentText()
+        update = self.update_split.isChecked()
+        sparse = self.sparse_split.isChecked()
+        
+        self.queue_job(f"Split {os.path.basename(file_path)}",
+                       WorkerJob("split", file_path, chunk_size, delete_original, output_dir,
+                                 workers=workers, resume=resume, content_defined=content_defined, codec=codec,
+                                 durability=durability, update=update, sparse=sparse))
     
     def start_merge(self):
         output_path = self.merge_output_path.text()
@@ -372,7 +740,9 @@ class FileSplitterUI(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please enter an output file name.")
             return
         
-        chunk_paths = [self.chunks_list.item(i).text() for i in range(self.chunks_list.count())]
+        chunk_paths = self.selected_chunks()
+        if chunk_paths is None:
+            return
         if not chunk_paths:
             QMessageBox.warning(self, "Warning", "Please add at least one chunk file.")
             return
@@ -387,15 +757,33 @@ class FileSplitterUI(QMainWindow):
             output_path = os.path.join(output_dir, os.path.basename(output_path))
         
         delete_chunks = self.delete_after_merge.isChecked()
+        workers = self.merge_workers.value()
+        resume = self.resume_merge.isChecked()
+        durability = self.merge_durability.currentText()
         
         try:
-            self.worker = WorkerThread("merge", output_path, chunk_paths, delete_chunks)
-            self.set_worker_connections(self.worker)
-            self.worker.start()
-            self.show_progress(True)
+            self.queue_job(f"Merge {os.path.basename(output_path)}",
+                           WorkerJob("merge", output_path, chunk_paths, delete_chunks,
+                                     workers=workers, resume=resume, durability=durability))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to start merge: {str(e)}")
     
+    def start_verify(self):
+        chunk_paths = self.selected_chunks()
+        if chunk_paths is None:
+            return
+        if not chunk_paths:
+            QMessageBox.warning(self, "Warning", "Please add at least one chunk file.")
+            return
+        
+        manifest_path = FileProcessor.find_manifest(chunk_paths)
+        if not manifest_path:
+            QMessageBox.warning(self, "Warning", "No manifest found next to the selected chunks.")
+            return
+        
+        self.queue_job(f"Verify {os.path.basename(manifest_path)}",
+                       WorkerJob("verify", manifest_path, self.merge_workers.value()))
+    
     def start_auto_split(self):
         dir_path = self.auto_dir_path.text()
         if not dir_path:
@@ -405,11 +793,27 @@ class FileSplitterUI(QMainWindow):
         chunk_size = self.auto_chunk_size.value() * 1024 * 1024
         delete_original = self.auto_delete_after_split.isChecked()
         output_dir = self.auto_output_dir.text() or None
-        
-        self.worker = WorkerThread("auto_split", dir_path, chunk_size, delete_original, output_dir)
-        self.set_worker_connections(self.worker)
-        self.worker.start()
-        self.show_progress(True)
+        workers = self.auto_workers.value()
+        resume = self.auto_resume.isChecked()
+        content_defined = self.auto_content_defined.isChecked()
+        codec = self.auto_codec.currentText()
+        store_dir = self.auto_store_dir.text()
+        recursive = self.auto_recursive.isChecked()
+        max_jobs = self.auto_max_jobs.value()
+        durability = self.auto_durability.currentText()
+        update = self.auto_update.isChecked()
+        sparse = self.auto_sparse.isChecked()
+        
+        if store_dir:
+            # The store picks its own boundaries: content-defined, which makes chunks shareable, or fixed without numpy
+            self.queue_job(f"Store {dir_path}",
+                           WorkerJob("auto_store", dir_path, chunk_size, delete_original, output_dir, recursive,
+                                     max_jobs, store_dir, workers=workers, durability=durability))
+        else:
+            self.queue_job(f"Auto split {dir_path}",
+                           WorkerJob("auto_split", dir_path, chunk_size, delete_original, output_dir, recursive,
+                                     max_jobs, workers=workers, resume=resume, content_defined=content_defined,
+                                     codec=codec, durability=durability, update=update, sparse=sparse))
     
     def start_auto_merge(self):
         dir_path = self.auto_dir_path.text()
@@ -419,27 +823,101 @@ class FileSplitterUI(QMainWindow):
         
         delete_chunks = self.auto_delete_after_merge.isChecked()
         output_dir = self.auto_output_dir.text() or None
+        workers = self.auto_workers.value()
+        resume = self.auto_resume.isChecked()
+        store_dir = self.auto_store_dir.text()
+        recursive = self.auto_recursive.isChecked()
+        max_jobs = self.auto_max_jobs.value()
+        durability = self.auto_durability.currentText()
+        
+        if store_dir:
+            self.queue_job(f"Restore {dir_path}",
+                           WorkerJob("auto_restore", dir_path, delete_chunks, output_dir, recursive, store_dir,
+                                     workers=workers, durability=durability))
+        else:
+            self.queue_job(f"Auto merge {dir_path}",
+                           WorkerJob("auto_merge", dir_path, delete_chunks, output_dir, recursive, max_jobs,
+                                     workers=workers, resume=resume, durability=durability))
+    
+    def start_auto_pack(self):
+        dir_path = self.auto_dir_path.text()
+        if not dir_path:
+            QMessageBox.warning(self, "Warning", "Please select a directory.")
+            return
         
-        self.worker = WorkerThread("auto_merge", dir_path, delete_chunks, output_dir)
-        self.set_worker_connections(self.worker)
-        self.worker.start()
-        self.show_progress(True)
+        # Files up to the chunk size are the ones auto split leaves alone
+        chunk_size = self.auto_chunk_size.value() * 1024 * 1024
+        self.queue_job(f"Pack {dir_path}",
+                       WorkerJob("auto_pack", dir_path, chunk_size, self.auto_delete_after_split.isChecked(),
+                                 self.auto_output_dir.text() or None, self.auto_recursive.isChecked(),
+                                 workers=self.auto_workers.value(), durability=self.auto_durability.currentText()))
     
-    def set_worker_connections(self, worker):
-        worker.progress_updated.connect(self.update_progress)
-        worker.operation_completed.connect(self.operation_finished)
+    def start_auto_unpack(self):
+        dir_path = self.auto_dir_path.text()
+        if not dir_path:
+            QMessageBox.warning(self, "Warning", "Please select a directory.")
+            return
+        
+        self.queue_job(f"Unpack {dir_path}",
+                       WorkerJob("auto_unpack", dir_path, self.auto_delete_after_merge.isChecked(),
+                                 self.auto_output_dir.text() or None, self.auto_recursive.isChecked(),
+                                 workers=self.auto_workers.value(), durability=self.auto_durability.currentText()))
     
-    def update_progress(self, value):
-        self.progress_bar.setValue(value)
+    def queue_job(self, description, job):
+        """Adds a row for job and hands it to the thread pool, which starts it when a slot is free."""
+        row = self.jobs_table.rowCount()
+        self.jobs_table.insertRow(row)
+        name_item = QTableWidgetItem(description)
+        name_item.setToolTip(description)
+        status_item = QTableWidgetItem("Queued")
+        progress_bar = QProgressBar()
+        progress_bar.setValue(0)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(lambda: self.cancel_job(job))
+        self.jobs_table.setItem(row, 0, name_item)
+        self.jobs_table.setItem(row, 1, status_item)
+        self.jobs_table.setCellWidget(row, 2, progress_bar)
+        self.jobs_table.setCellWidget(row, 3, cancel_btn)
+        self.jobs.append([job, status_item, progress_bar, cancel_btn])
+        
+        job.signals.job_started.connect(lambda: status_item.setText("Running"))
+        job.signals.progress_updated.connect(progress_bar.setValue)
+        job.signals.operation_completed.connect(
+            lambda message, success: self.job_finished(job, status_item, progress_bar, cancel_btn, message, success))
+        self.pool.start(job)
     
-    def operation_finished(self, message, success):
-        self.show_progress(False)
+    def job_finished(self, job, status_item, progress_bar, cancel_btn, message, success):
+        cancel_btn.setEnabled(False)
+        status_item.setToolTip(message)
+        self.status_bar.showMessage(message.splitlines()[0])
         if success:
-            QMessageBox.information(self, "Success", message)
+            status_item.setText("Done")
+            progress_bar.setValue(100)
+        elif job.cancel_event.is_set():
+            status_item.setText("Cancelled")
         else:
+            status_item.setText("Failed")
             QMessageBox.critical(self, "Error", message)
     
-    def show_progress(self, show):
-        self.progress_bar.setVisible(show)
-        if show:
-            self.progress_bar.setValue(0)
\ No newline at end of file
+    def cancel_job(self, job):
+        """Drops a queued job, or asks a running one to stop at its next chunk boundary."""
+        job.cancel()
+        if self.pool.tryTake(job):
+            job.signals.operation_completed.emit("Cancelled before it started.", False)
+    
+    def cancel_all_jobs(self):
+        for job, _, _, cancel_btn in self.jobs:
+            if cancel_btn.isEnabled():
+                self.cancel_job(job)
+    
+    def clear_finished_jobs(self):
+        for row in reversed(range(len(self.jobs))):
+            if not self.jobs[row][3].isEnabled():
+                self.jobs_table.removeRow(row)
+                del self.jobs[row]
+    
+    def closeEvent(self, event):
+        # Stop at chunk boundaries so nothing is left half-written when the window goes away
+        self.cancel_all_jobs()
+        self.pool.waitForDone()
+        super().closeEvent(event)
\ No newline at end of file
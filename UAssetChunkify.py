@@ -1,111 +1,117 @@
+"""Interactive prompts for splitting and merging the files in one directory.
+
+All the work is done by the chunkify package in "Chunckify With UI"; this script only asks
+the questions. Importing it has no side effects, and cli.py there runs the same operations
+without prompts.
+"""
+import logging
 import os
-import re
+import sys
+
+# The package lives next to the GUI; nothing is installed, so its folder goes on the import path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Chunckify With UI"))
 
-CHUNK_SIZE = 25 * 1024 * 1024  # 25MB default chunk size
+from chunkify import tracing  # noqa: E402
+from chunkify.core import FileProcessor, CHUNK_SIZE, DEFAULT_WORKERS  # noqa: E402
 
-def split_file(file_path, chunk_size=CHUNK_SIZE):
-    """Splits a large .uasset file into 25MB chunks."""
+def report_chunk(event):
+    """Prints each finished chunk as the core reports it."""
+    if event["event"] == "chunk":
+        verb = "Created" if event["operation"] == "split" else "Merged"
+        print(f"✅ {verb}: {event['chunk']} ({event['chunk_bytes']} bytes)")
+
+def split_file(file_path, chunk_size=CHUNK_SIZE, codec="none"):
+    """Splits a large .uasset file into 25MB chunks, optionally compressing them and deleting the original."""
     if not os.path.exists(file_path):
         print("❌ File not found!")
         return
 
-    file_name, file_ext = os.path.splitext(file_path)
-    
-    with open(file_path, 'rb') as f:
-        chunk_index = 0
-        while True:
-            chunk = f.read(chunk_size)
-            if not chunk:
-                break  # End of file
-            
-            chunk_filename = f"{file_name}_part{chunk_index:03d}{file_ext}"
-            with open(chunk_filename, 'wb') as chunk_file:
-                chunk_file.write(chunk)
-            
-            print(f"✅ Created: {chunk_filename} ({len(chunk)} bytes)")
-            chunk_index += 1
-
-    print(f"\n✅ File split into {chunk_index} parts.")
-
-    # Ask user if they want to delete the original file
-    delete_original = input(f"🗑️ Do you want to delete the original file '{file_path}'? (y/n): ").strip().lower()
-    if delete_original == 'y':
-        os.remove(file_path)
+    # Asked up front so the core only deletes the original once the chunks are safely on disk
+    answer = input(f"🗑️ Do you want to delete the original file '{file_path}'? (y/n): ")
+    delete_original = answer.strip().lower() == 'y'
+
+    # With resume, running the script again after a Ctrl-C keeps the chunks its journal lists as done
+    chunk_count = FileProcessor.split_file(file_path, chunk_size, delete_original, workers=DEFAULT_WORKERS,
+                                           resume=True, codec=codec, progress_callback=report_chunk)
+    print(f"\n✅ File split into {chunk_count} parts.")
+    if delete_original:
         print(f"🗑️ Deleted: {file_path}")
 
+def merge_files(output_path, chunks, label):
+    """Merges one group of chunks into output_path, optionally deleting them afterwards."""
+    manifest_path = FileProcessor.find_manifest(chunks)
+    # As in split_file, the core deletes the chunks only after the merged file is durable
+    answer = input(f"🗑️ Do you want to delete the split files for '{label}'? (y/n): ")
+    delete_chunks = answer.strip().lower() == 'y'
+
+    FileProcessor.merge_files(output_path, list(chunks), delete_chunks, workers=DEFAULT_WORKERS, resume=True,
+                              progress_callback=report_chunk)
+    print(f"\n✅ Successfully reconstructed: {output_path}")
+    if delete_chunks:
+        for file in chunks + ([manifest_path] if manifest_path else []):
+            print(f"🗑️ Deleted: {file}")
+
 def auto_merge_files(directory):
     """Automatically detects and merges split files in a directory."""
-    os.chdir(directory)  # Change working directory to user input
-
-    # Find all chunked files with pattern *_partXXX.*
-    chunk_files = [f for f in os.listdir() if re.search(r"_part\d+\.", f)]
-    if not chunk_files:
+    file_groups = FileProcessor.find_chunk_groups(directory)
+    if not file_groups:
         print("❌ No split files found in the directory.")
         return
 
-    # Group files by common prefix
-    file_groups = {}
-    for file in chunk_files:
-        prefix = re.split(r"_part\d+\.", file)[0]  # Extract prefix
-        if prefix not in file_groups:
-            file_groups[prefix] = []
-        file_groups[prefix].append(file)
-
-    # Merge each group
-    for prefix, files in file_groups.items():
-        files.sort(key=lambda x: int(re.search(r"_part(\d+)", x).group(1)))  # Sort by part number
-        output_file_name = f"{prefix}{os.path.splitext(files[0])[1]}"  # Keep original filename without "_merged"
-
-        with open(output_file_name, 'wb') as output_file:
-            for file in files:
-                with open(file, 'rb') as f:
-                    output_file.write(f.read())
-                print(f"✅ Merged: {file} -> {output_file_name}")
-
-        print(f"\n✅ Successfully reconstructed: {output_file_name}")
-
-        # Ask user if they want to delete the split files
-        delete_chunks = input(f"🗑️ Do you want to delete the split files for '{prefix}'? (y/n): ").strip().lower()
-        if delete_chunks == 'y':
-            for file in files:
-                os.remove(file)
-                print(f"🗑️ Deleted: {file}")
-
-def auto_slice_files(directory, chunk_size=CHUNK_SIZE):
-    """Automatically finds large files in a directory and splits them into chunks."""
-    os.chdir(directory)  # Change working directory to user input
-    files = [f for f in os.listdir() if os.path.isfile(f) and not re.search(r"_part\d+\.", f)]
+    for prefix, chunks in file_groups.items():
+        chunks = [os.path.normpath(os.path.join(directory, chunk)) for chunk in chunks]
+        # Keep original filename without "_merged"
+        output_path = os.path.normpath(FileProcessor.merge_output_path(directory, prefix, chunks))
+        merge_files(output_path, chunks, prefix)
 
+def ask_codec():
+    """Asks which compression to apply to new chunks."""
+    choice = input("🗜️ Compress chunks? [N]one, [Z]lib or [L]zma: ").strip().lower()
+    return {"z": "zlib", "l": "lzma"}.get(choice, "none")
+
+def auto_slice_files(directory, chunk_size=CHUNK_SIZE, codec="none"):
+    """Automatically finds large files in a directory and splits them into chunks."""
+    files = FileProcessor.find_large_files(directory, chunk_size)
     if not files:
-        print("❌ No files found in the directory.")
+        print("❌ No files larger than the chunk size found in the directory.")
         return
 
     for file in files:
-        file_size = os.path.getsize(file)
-        if file_size > chunk_size:
-            print(f"📂 Splitting '{file}' ({file_size} bytes)...")
-            split_file(file)
-
-# 🛠 User Input for Directory & Action
-directory = input("📂 Enter the directory path: ").strip()
-if not os.path.isdir(directory):
-    print("❌ Invalid directory! Please enter a valid path.")
-    exit()
-
-os.chdir(directory)  # Change working directory to user input
-
-action = input("🔄 Do you want to [S]plit, [M]erge, [A]uto Merge, or [X] Auto Slice? ").strip().lower()
-
-if action == "s":
-    file_name = input("📁 Enter the .uasset file name to split: ").strip()
-    split_file(file_name)
-elif action == "m":
-    output_file = input("📁 Enter the output file name (e.g., merged_file.uasset): ").strip()
-    chunk_prefix = input("🔍 Enter the prefix of split files (without '_partXXX.uasset'): ").strip()
-    merge_files(output_file, chunk_prefix) # type: ignore
-elif action == "a":
-    auto_merge_files(directory)
-elif action == "x":
-    auto_slice_files(directory)
-else:
-    print("❌ Invalid choice! Please enter 'S' for Split, 'M' for Merge, 'A' for Auto Merge, or 'X' for Auto Slice.")
+        file_path = os.path.normpath(os.path.join(directory, file))
+        print(f"📂 Splitting '{file}' ({os.path.getsize(file_path)} bytes)...")
+        split_file(file_path, chunk_size, codec)
+
+def main():
+    # 🛠 User Input for Directory & Action
+    directory = input("📂 Enter the directory path: ").strip()
+    if not os.path.isdir(directory):
+        print("❌ Invalid directory! Please enter a valid path.")
+        return
+
+    os.chdir(directory)  # Change working directory to user input
+
+    action = input("🔄 Do you want to [S]plit, [M]erge, [A]uto Merge, or [X] Auto Slice? ").strip().lower()
+
+    if action == "s":
+        file_name = input("📁 Enter the .uasset file name to split: ").strip()
+        split_file(file_name, codec=ask_codec())
+    elif action == "m":
+        output_file = input("📁 Enter the output file name (e.g., merged_file.uasset): ").strip()
+        chunk_prefix = input("🔍 Enter the prefix of split files (without '_partXXX.uasset'): ").strip()
+        chunks = FileProcessor.find_chunk_groups(".").get(chunk_prefix)
+        if chunks:
+            merge_files(output_file, chunks, chunk_prefix)
+        else:
+            print(f"❌ No split files found for '{chunk_prefix}'.")
+    elif action == "a":
+        auto_merge_files(".")
+    elif action == "x":
+        auto_slice_files(".", codec=ask_codec())
+    else:
+        print("❌ Invalid choice! Please enter 'S' for Split, 'M' for Merge, 'A' for Auto Merge, or 'X' for Auto Slice.")
+
+if __name__ == "__main__":
+    # The package logs its status lines instead of printing them
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    with tracing.profiling():
+        main()
\ No newline at end of file
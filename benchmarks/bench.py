@@ -0,0 +1,329 @@
+"""Split/merge benchmarks for the FileProcessor API and UAssetChunkify.py.
+
+Synthetic inputs (random, zero-filled and compressible data) are generated once per
+size from a fixed seed, so runs on the same machine are comparable. Every case runs
+in a fresh child process, which lets peak RSS and syscall counts be attributed to that
+case alone: peak RSS comes from /proc/self/status (wait4 where that's missing),
+read/write syscall counts from /proc/self/io, and with --strace the full syscall
+count from strace -c. Data is usually still in the page cache, so the numbers
+describe the copy engine more than the disk.
+
+    python benchmarks/bench.py --sizes 64,256 --chunk-sizes 8,25 --output results.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json   # flag regressions
+    python benchmarks/bench.py --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE_DIR = os.path.join(REPO_ROOT, "Chunckify With UI")
+SCRIPT_PATH = os.path.join(REPO_ROOT, "UAssetChunkify.py")
+SCRIPT_CHUNK_SIZE = 25  # MB; UAssetChunkify.py always splits at its built-in size
+
+MB = 1024 * 1024
+DATA_KINDS = ("random", "zeros", "compressible")
+CASES = ("api_split", "api_merge", "api_auto_split", "api_auto_merge",
+         "script_split", "script_auto_split", "script_auto_merge")
+AUTO_FILE_COUNT = 4  # files of the chosen size in the directory for the auto cases
+
+def generate(path: str, size: int, kind: str, seed: int = 1234) -> None:
+    """Writes size bytes of the given kind; the same arguments always give the same file."""
+    rng = random.Random(seed)
+    # A small vocabulary of blocks with light mutations compresses roughly like asset data
+    vocabulary = [rng.randbytes(1024) for _ in range(64)]
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size:
+            length = min(MB, size - written)
+            if kind == "random":
+                block = rng.randbytes(length)
+            elif kind == "zeros":
+                block = bytes(length)
+            else:
+                block = bytearray(b"".join(rng.choice(vocabulary) for _ in range(length // 1024 + 1))[:length])
+                for _ in range(length // 4096):
+                    block[rng.randrange(length)] = rng.randrange(256)
+            f.write(block)
+            written += length
+
+def _proc_io() -> dict:
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except OSError:
+        return {}
+
+def _peak_rss_kb():
+    """Peak RSS of this process since exec; ru_maxrss would also count the parent's memory at fork."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def _chunk_paths(directory: str) -> list:
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if "_part" in name)
+
+def _run_script(answers: list) -> None:
+    """Runs UAssetChunkify.py with its prompts answered from answers."""
+    stdin = sys.stdin
+    sys.stdin = io.StringIO("\n".join(answers) + "\n")
+    try:
+        runpy.run_path(SCRIPT_PATH, run_name="__main__")
+    finally:
+        sys.stdin = stdin
+
+def run_child(case: dict) -> None:
+    """Runs one prepared case in this process and writes its measurements to case["result_path"]."""
+    sys.path.insert(0, CORE_DIR)
+    from chunkify.core import FileProcessor
+    from chunkify.scheduler import Job, run_jobs
+
+    work_dir = case["work_dir"]
+    chunk_size = case["chunk_size"]
+    workers = case["workers"]
+    codec = case["codec"]
+    files = [os.path.join(work_dir, name) for name in case["inputs"]]
+    out_dir = os.path.join(work_dir, "out")
+
+    def operation():
+        name = case["case"]
+        if name == "api_split":
+            FileProcessor.split_file(files[0], chunk_size, output_dir=out_dir, workers=workers, codec=codec)
+        elif name == "api_merge":
+            FileProcessor.merge_files(os.path.join(out_dir, "merged.bin"), _chunk_paths(work_dir), workers=workers)
+        elif name == "api_auto_split":
+            jobs = [Job(os.path.getsize(os.path.join(work_dir, file)), FileProcessor.split_file,
+                        os.path.join(work_dir, file), chunk_size, False, out_dir, workers=workers, codec=codec)
+                    for file in FileProcessor.find_large_files(work_dir, chunk_size)]
+            run_jobs(jobs, case["jobs"])
+        elif name == "api_auto_merge":
+            groups = FileProcessor.find_chunk_groups(work_dir)
+            jobs = [Job(0, FileProcessor.merge_files, os.path.join(out_dir, prefix + ".bin"),
+                        [os.path.join(work_dir, chunk) for chunk in chunks], workers=workers)
+                    for prefix, chunks in groups.items()]
+            run_jobs(jobs, case["jobs"])
+        elif name == "script_split":
+            _run_script([work_dir, "s", case["inputs"][0], "n", "n"])
+        elif name == "script_auto_split":
+            _run_script([work_dir, "x", "n"] + ["n"] * len(files))
+        elif name == "script_auto_merge":
+            _run_script([work_dir, "a"] + ["n"] * len(case["inputs"]))
+
+    before = _proc_io()
+    started = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        operation()
+    seconds = time.perf_counter() - started
+    after = _proc_io()
+
+    result = {"seconds": seconds, "peak_rss_kb": _peak_rss_kb()}
+    for key in ("syscr", "syscw", "rchar", "wchar"):
+        if key in after:
+            result[key] = after[key] - before.get(key, 0)
+    with open(case["result_path"], 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+def _strace_total(path: str):
+    """Returns the total call count from an strace -c summary, or None."""
+    try:
+        with open(path) as f:
+            for line in f:
+                # % time, seconds, usecs/call, calls, [errors,] "total"
+                fields = line.split()
+                if fields and fields[-1] == "total" and len(fields) >= 5:
+                    return int(fields[3])
+    except OSError:
+        pass
+    return None
+
+def _spawn(case: dict, use_strace: bool) -> dict:
+    command = [sys.executable, os.path.abspath(__file__), "--child", json.dumps(case)]
+    strace_path = case["result_path"] + ".strace"
+    if use_strace:
+        command = ["strace", "-f", "-c", "-o", strace_path] + command
+    process = subprocess.Popen(command)
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        peak_rss_kb = usage.ru_maxrss
+    else:
+        process.wait()
+        peak_rss_kb = None
+    if process.returncode != 0:
+        raise RuntimeError(f"Benchmark case failed: {case['case']} (exit code {process.returncode})")
+
+    with open(case["result_path"], 'r', encoding='utf-8') as f:
+        result = json.load(f)
+    if result["peak_rss_kb"] is None:
+        result["peak_rss_kb"] = peak_rss_kb
+    if use_strace:
+        result["syscalls"] = _strace_total(strace_path)
+    return result
+
+def _link_or_copy(source: str, path: str) -> None:
+    try:
+        os.link(source, path)
+    except OSError:
+        shutil.copyfile(source, path)
+
+def _prepare(case_name: str, source: str, chunk_size: int, work_dir: str) -> list:
+    """Lays out the inputs a case starts from in work_dir and returns their names."""
+    sys.path.insert(0, CORE_DIR)
+    from chunkify.core import FileProcessor
+
+    os.makedirs(os.path.join(work_dir, "out"))
+    count = AUTO_FILE_COUNT if "auto" in case_name else 1
+    names = [f"asset{i}.uasset" for i in range(count)]
+    for name in names:
+        if case_name.endswith("split"):
+            # Splitting only reads its input, so a link to the cached source is enough
+            _link_or_copy(source, os.path.join(work_dir, name))
+        else:
+            # Merge cases start from chunks only, so no merge can overwrite the cached source
+            staged = os.path.join(work_dir, "out", name)
+            _link_or_copy(source, staged)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                FileProcessor.split_file(staged, chunk_size, output_dir=work_dir,
+                                         manifest=case_name.startswith("api"))
+            os.remove(staged)
+    return names
+
+def run_matrix(args) -> dict:
+    results = []
+    cache_dir = args.cache_dir or os.path.join(tempfile.gettempdir(), "chunkify-bench-data")
+    os.makedirs(cache_dir, exist_ok=True)
+    for size_mb in args.sizes:
+        for kind in args.data:
+            source = os.path.join(cache_dir, f"{kind}-{size_mb}MB.bin")
+            if not os.path.exists(source) or os.path.getsize(source) != size_mb * MB:
+                generate(source, size_mb * MB, kind)
+            for case_name in args.cases:
+                # The script only knows its built-in chunk size
+                chunk_sizes = [SCRIPT_CHUNK_SIZE] if case_name.startswith("script") else args.chunk_sizes
+                for chunk_mb in chunk_sizes:
+                    key = f"{case_name}/{kind}/{size_mb}MB/{chunk_mb}MB"
+                    if case_name.endswith("auto_split") and size_mb <= chunk_mb:
+                        # Auto split only picks files larger than the chunk size, so this would time a no-op
+                        print(f"{key:55} skipped: {size_mb} MB inputs are not larger than the chunk size")
+                        continue
+                    runs = []
+                    for _ in range(args.repeat):
+                        with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+                            case = {
+                                "case": case_name,
+                                "work_dir": work_dir,
+                                "chunk_size": chunk_mb * MB,
+                                "workers": args.workers,
+                                "jobs": args.jobs,
+                                "codec": args.codec,
+                                "result_path": os.path.join(work_dir, "result.json"),
+                            }
+                            case["inputs"] = _prepare(case_name, source, chunk_mb * MB, work_dir)
+                            runs.append(_spawn(case, args.strace))
+                    # Best of the repeats: the least disturbed by other activity on the machine
+                    best = min(runs, key=lambda run: run["seconds"])
+                    total_mb = size_mb * (AUTO_FILE_COUNT if "auto" in case_name else 1)
+                    best.update(case=key, bytes=total_mb * MB,
+                                mb_per_s=round(total_mb / best["seconds"], 2) if best["seconds"] else None)
+                    best["seconds"] = round(best["seconds"], 4)
+                    results.append(best)
+                    print(f"{key:55} {best['mb_per_s']:>9} MB/s  {best['peak_rss_kb'] or 0:>8} KB RSS  "
+                          f"{best.get('syscr', '-')}/{best.get('syscw', '-')} r/w calls")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers,
+            "jobs": args.jobs,
+            "codec": args.codec,
+            "repeat": args.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Returns a message for every case that got slower or bigger than threshold allows."""
+    previous = {result["case"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get(result["case"])
+        if not before:
+            continue
+        if before.get("mb_per_s") and result.get("mb_per_s") is not None \
+                and result["mb_per_s"] < before["mb_per_s"] * (1 - threshold):
+            regressions.append(f"{result['case']}: {result['mb_per_s']} MB/s, baseline {before['mb_per_s']} MB/s")
+        for key in ("peak_rss_kb", "syscr", "syscw", "syscalls"):
+            if before.get(key) and result.get(key) is not None and result[key] > before[key] * (1 + threshold):
+                regressions.append(f"{result['case']}: {key} {result[key]}, baseline {before[key]}")
+    return regressions
+
+def _int_list(value: str) -> list:
+    return [int(item) for item in value.split(",") if item]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Chunkify split and merge.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--sizes", type=_int_list, default=[64, 256], help="file sizes in MB (default 64,256)")
+    parser.add_argument("--chunk-sizes", type=_int_list, default=[8, 25], help="chunk sizes in MB (default 8,25)")
+    parser.add_argument("--data", type=lambda v: v.split(","), default=list(DATA_KINDS),
+                        help=f"data kinds (default {','.join(DATA_KINDS)})")
+    parser.add_argument("--cases", type=lambda v: v.split(","), default=list(CASES),
+                        help=f"cases to run (default {','.join(CASES)})")
+    parser.add_argument("--workers", type=int, default=1, help="FileProcessor workers per file (default 1)")
+    parser.add_argument("--jobs", type=int, default=1, help="files processed at once in auto cases (default 1)")
+    parser.add_argument("--codec", default="none", help="chunk codec for API splits (default none)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept (default 3)")
+    parser.add_argument("--strace", action="store_true", help="count all syscalls with strace -c")
+    parser.add_argument("--cache-dir", help="where generated inputs are kept between runs")
+    parser.add_argument("--work-dir", help="where cases run (default: system temp directory)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved earlier")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed regression, as a fraction (default 0.1)")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(json.loads(args.child))
+        return 0
+
+    unknown = set(args.cases) - set(CASES) | set(args.data) - set(DATA_KINDS)
+    if unknown:
+        parser.error(f"unknown case or data kind: {', '.join(sorted(unknown))}")
+    if args.strace and not shutil.which("strace"):
+        parser.error("--strace needs strace on PATH")
+
+    report = run_matrix(args)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"⚠️ Regression: {regression}")
+        if regressions:
+            return 1
+        print("✅ No regressions against the baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,25 @@
+import glob
+import os
+import random
+import sys
+
+import pytest
+
+# The package isn't installed; it lives next to the GUI, as UAssetChunkify.py and the benchmarks assume
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Chunckify With UI"))
+
+@pytest.fixture
+def make_file(tmp_path):
+    """Returns a function that writes size seeded random bytes to tmp_path/name and returns its path."""
+    def make(name: str, size: int, seed: int = 1) -> str:
+        path = tmp_path / name
+        path.write_bytes(random.Random(seed).randbytes(size))
+        return str(path)
+    return make
+
+@pytest.fixture
+def chunk_paths():
+    """Returns a function listing the _partNNN files of one chunk set in a directory, in part order."""
+    def find(directory, prefix: str) -> list:
+        return sorted(glob.glob(os.path.join(str(directory), f"{glob.escape(prefix)}_part*")))
+    return find
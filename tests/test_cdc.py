@@ -0,0 +1,50 @@
+import io
+import json
+import logging
+import random
+
+import pytest
+
+from chunkify import cdc
+from chunkify.core import FileProcessor
+
+def random_bytes(size: int, seed: int = 7) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Several scan blocks in a few hundred KB, so the carried-over window is exercised
+    monkeypatch.setattr(cdc, "SCAN_BLOCK_SIZE", 64 * 1024)
+
+def test_python_and_numpy_scans_find_the_same_cut_points(small_blocks):
+    tables = cdc._load_numpy()
+    if not tables:
+        pytest.skip("numpy is not installed")
+    data = random_bytes(300 * 1024)
+    for avg_size in (1024, 4096, 16384):
+        strict, loose = cdc._masks(avg_size)
+        expected = cdc._scan_python(io.BytesIO(data), strict, loose)
+        assert expected[1], "the masks should produce cut points in random data"
+        assert cdc._scan_numpy(io.BytesIO(data), strict, loose, tables) == expected
+
+def test_chunk_ranges_do_not_depend_on_numpy(small_blocks, tmp_path, monkeypatch):
+    if not cdc.has_numpy():
+        pytest.skip("numpy is not installed")
+    path = tmp_path / "data.bin"
+    path.write_bytes(random_bytes(200 * 1024))
+    with_numpy = cdc.chunk_ranges(str(path), 4096)
+    monkeypatch.setattr(cdc, "_load_numpy", lambda: None)
+    assert cdc.chunk_ranges(str(path), 4096) == with_numpy
+    assert sum(length for _, length in with_numpy) == 200 * 1024
+
+def test_content_defined_split_falls_back_to_fixed_offsets_without_numpy(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(cdc, "has_numpy", lambda: False)
+    path = tmp_path / "Hero.uasset"
+    path.write_bytes(random_bytes(10_000))
+    with caplog.at_level(logging.WARNING, logger="chunkify"):
+        count = FileProcessor.split_file(str(path), 4096, content_defined=True)
+    assert count == 3
+    assert "numpy is not installed" in caplog.text
+    manifest = json.loads((tmp_path / "Hero.uasset.manifest.json").read_text())
+    assert not manifest["content_defined"]
+    assert [chunk["size"] for chunk in manifest["chunks"]] == [4096, 4096, 1808]
@@ -0,0 +1,56 @@
+import json
+import os
+import random
+
+import pytest
+
+from chunkify.chunk_codecs import available_codecs
+from chunkify.core import FileProcessor
+
+CHUNK = 64 * 1024
+
+@pytest.fixture
+def compressible_file(tmp_path):
+    """Text-like data that every codec shrinks, with a random tail that none can."""
+    rng = random.Random(3)
+    words = [b"mesh", b"texture", b"material", b"skeleton", b"blueprint", b"\x00\x00\x00\x00"]
+    data = b" ".join(rng.choice(words) for _ in range(60_000)) + rng.randbytes(CHUNK // 2)
+    path = tmp_path / "Hero.uasset"
+    path.write_bytes(data)
+    return str(path)
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_codec_round_trip(tmp_path, compressible_file, chunk_paths, codec):
+    FileProcessor.split_file(compressible_file, CHUNK, output_dir=str(tmp_path / "chunks"), workers=3, codec=codec)
+    parts = chunk_paths(tmp_path / "chunks", "Hero")
+    with open(str(tmp_path / "chunks" / "Hero.uasset.manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest["codec"] == codec
+    if codec != "none":
+        assert sum(os.path.getsize(part) for part in parts) < os.path.getsize(compressible_file)
+        assert all(chunk["raw_size"] <= CHUNK for chunk in manifest["chunks"])
+
+    # The codec comes from the manifest; merge_files isn't told
+    output_path = str(tmp_path / "merged" / "Hero.uasset")
+    FileProcessor.merge_files(output_path, parts, workers=3)
+    with open(compressible_file, "rb") as original, open(output_path, "rb") as merged:
+        assert original.read() == merged.read()
+
+@pytest.mark.parametrize("codec", [codec for codec in available_codecs() if codec != "none"])
+def test_compressed_chunks_merge_without_a_manifest_when_told_the_codec(tmp_path, compressible_file, chunk_paths,
+                                                                        codec):
+    FileProcessor.split_file(compressible_file, CHUNK, output_dir=str(tmp_path / "chunks"), codec=codec)
+    os.remove(str(tmp_path / "chunks" / "Hero.uasset.manifest.json"))
+    output_path = str(tmp_path / "Hero.uasset")
+    FileProcessor.merge_files(output_path, chunk_paths(tmp_path / "chunks", "Hero"), codec=codec)
+    with open(compressible_file, "rb") as original, open(output_path, "rb") as merged:
+        assert original.read() == merged.read()
+
+def test_damaged_compressed_chunk_fails_verification(tmp_path, compressible_file, chunk_paths):
+    FileProcessor.split_file(compressible_file, CHUNK, output_dir=str(tmp_path / "chunks"), codec="zlib")
+    parts = chunk_paths(tmp_path / "chunks", "Hero")
+    with open(parts[0], "r+b") as f:
+        f.seek(10)
+        f.write(b"\xff\xff")
+    with pytest.raises(ValueError):
+        FileProcessor.merge_files(str(tmp_path / "Hero.uasset"), parts)
@@ -0,0 +1,51 @@
+import json
+import os
+
+import pytest
+
+from chunkify.core import FileProcessor
+
+CHUNK = 64 * 1024
+
+def test_manifest_lists_every_chunk_with_its_size_and_hash(tmp_path, make_file, chunk_paths):
+    path = make_file("Hero.uasset", 3 * CHUNK + 100)
+    assert FileProcessor.split_file(path, CHUNK) == 4
+    manifest_path = path + ".manifest.json"
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest["size"] == 3 * CHUNK + 100
+    names = [os.path.basename(chunk_path) for chunk_path in chunk_paths(tmp_path, "Hero")]
+    assert [chunk["name"] for chunk in manifest["chunks"]] == names
+    assert [chunk["size"] for chunk in manifest["chunks"]] == [CHUNK, CHUNK, CHUNK, 100]
+    assert FileProcessor.verify_chunks(manifest_path, 2) == []
+
+def test_verify_reports_corrupt_and_missing_chunks(tmp_path, make_file, chunk_paths):
+    path = make_file("Hero.uasset", 3 * CHUNK)
+    FileProcessor.split_file(path, CHUNK)
+    parts = chunk_paths(tmp_path, "Hero")
+    with open(parts[1], "r+b") as f:
+        f.write(b"\xff")
+    os.remove(parts[2])
+    problems = FileProcessor.verify_chunks(path + ".manifest.json", 2)
+    assert len(problems) == 2
+    assert any(os.path.basename(parts[1]) in problem for problem in problems)
+    assert any(os.path.basename(parts[2]) in problem for problem in problems)
+
+def test_merge_refuses_chunks_that_fail_verification(tmp_path, make_file, chunk_paths):
+    path = make_file("Hero.uasset", 2 * CHUNK)
+    FileProcessor.split_file(path, CHUNK, output_dir=str(tmp_path / "chunks"))
+    parts = chunk_paths(tmp_path / "chunks", "Hero")
+    with open(parts[0], "r+b") as f:
+        f.write(b"\x00\x01")
+    output_path = str(tmp_path / "merged" / "Hero.uasset")
+    with pytest.raises(ValueError, match="verification failed"):
+        FileProcessor.merge_files(output_path, parts)
+    assert not os.path.exists(output_path)
+
+def test_split_and_merge_round_trip(tmp_path, make_file, chunk_paths):
+    path = make_file("Hero.uasset", 5 * CHUNK + 7)
+    FileProcessor.split_file(path, CHUNK, output_dir=str(tmp_path / "chunks"), workers=3)
+    output_path = str(tmp_path / "merged" / "Hero.uasset")
+    FileProcessor.merge_files(output_path, chunk_paths(tmp_path / "chunks", "Hero"), workers=3)
+    with open(path, "rb") as original, open(output_path, "rb") as merged:
+        assert original.read() == merged.read()
@@ -0,0 +1,105 @@
+import json
+import os
+import random
+
+import pytest
+
+from chunkify import packing, scanner
+
+CHUNK = 16 * 1024
+
+@pytest.fixture
+def content(tmp_path):
+    """A folder of small files in nested directories, plus one file too large to pack."""
+    rng = random.Random(5)
+    root = tmp_path / "Content"
+    files = {}
+    for index in range(30):
+        relative = os.path.join(*(["Maps", "Sub"][:index % 3] + [f"asset{index:02d}.uasset"]))
+        files[relative] = rng.randbytes(rng.randrange(0, 3000))
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(files[relative])
+    (root / "Big.uasset").write_bytes(rng.randbytes(CHUNK + 1))
+    return root, files
+
+def read_tree(root) -> dict:
+    tree = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                tree[os.path.relpath(path, root)] = f.read()
+    return tree
+
+def test_pack_and_unpack_round_trip(tmp_path, content):
+    root, files = content
+    index_path = packing.pack_files(str(root), chunk_size=CHUNK, output_dir=str(tmp_path / "packs"), recursive=True)
+    with open(index_path, encoding="utf-8") as f:
+        index = json.load(f)
+    assert len(index["bundles"]) > 1
+    assert all(bundle["size"] <= CHUNK for bundle in index["bundles"])
+    assert "Big.uasset" not in {member for member, _, _ in index["members"]}
+
+    assert packing.unpack_files(index_path, str(tmp_path / "restored"), workers=2) == len(files)
+    assert read_tree(tmp_path / "restored") == files
+
+def test_pack_reader_reads_single_members(tmp_path, content):
+    root, files = content
+    index_path = packing.pack_files(str(root), chunk_size=CHUNK, output_dir=str(tmp_path / "packs"), recursive=True)
+    with packing.PackReader(index_path) as reader:
+        assert reader.verify() == []
+        for relative in reversed(sorted(files)):
+            assert reader.read(relative.replace(os.sep, "/")) == files[relative]
+
+def test_delete_flags_remove_originals_and_then_the_pack(tmp_path, content):
+    root, files = content
+    big = (root / "Big.uasset").read_bytes()
+    index_path = packing.pack_files(str(root), chunk_size=CHUNK, recursive=True, delete_originals=True)
+    left = set(read_tree(root)) - {"Big.uasset", os.path.basename(index_path)}
+    assert left and all(name.endswith(scanner.PACK_EXTENSION) for name in left)
+
+    packing.unpack_files(index_path, str(root), delete_pack=True)
+    assert read_tree(root) == dict(files, **{"Big.uasset": big})
+
+def test_members_are_packed_at_their_size_on_disk_not_the_listed_one(tmp_path, content, monkeypatch):
+    root, files = content
+    # As from a stale scan index: the small files are listed 100 bytes shorter than they are
+    real_scan = scanner.scan_files
+    monkeypatch.setattr(scanner, "scan_files", lambda *args: [(path, max(size - 100, 0) if size <= CHUNK else size)
+                                                             for path, size in real_scan(*args)])
+    index_path = packing.pack_files(str(root), chunk_size=CHUNK, output_dir=str(tmp_path / "packs"), recursive=True)
+    packing.unpack_files(index_path, str(tmp_path / "restored"))
+    assert read_tree(tmp_path / "restored") == files
+
+def test_originals_that_change_while_packing_are_kept(tmp_path, content, monkeypatch):
+    root, files = content
+    real_write = packing._write_bundle
+    grown = []
+
+    def write_then_grow(directory, bundle_path, group, sync):
+        result = real_write(directory, bundle_path, group, sync)
+        grown.append(group[0][0])
+        with open(os.path.join(directory, group[0][0]), "ab") as f:
+            f.write(b"more")
+        return result
+    monkeypatch.setattr(packing, "_write_bundle", write_then_grow)
+    packing.pack_files(str(root), chunk_size=CHUNK, output_dir=str(tmp_path / "packs"), recursive=True,
+                       delete_originals=True)
+    assert set(read_tree(root)) == set(grown) | {"Big.uasset"}
+
+def test_damaged_bundle_stops_the_unpack(tmp_path, content):
+    root, _ = content
+    index_path = packing.pack_files(str(root), chunk_size=CHUNK, output_dir=str(tmp_path / "packs"), recursive=True)
+    bundle = sorted((tmp_path / "packs").glob("*.chunkpack"))[0]
+    data = bytearray(bundle.read_bytes())
+    data[0] ^= 0xFF
+    bundle.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="verification failed"):
+        packing.unpack_files(index_path, str(tmp_path / "restored"))
+    assert not (tmp_path / "restored").exists()
+
+def test_members_may_not_escape_the_output_directory(tmp_path):
+    for member in ("../evil", "/etc/passwd", "a/../../b", "C:/x"):
+        with pytest.raises(ValueError, match="Unsafe member path"):
+            packing._member_path(str(tmp_path), member)
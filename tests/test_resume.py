@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from chunkify.core import FileProcessor, JOURNAL_SUFFIX
+
+CHUNK = 64 * 1024
+
+# Taken before any test wraps them
+REAL = {name: getattr(FileProcessor, name) for name in ("_write_chunk", "_merge_chunk")}
+
+class Interrupted(Exception):
+    pass
+
+def fail_after(monkeypatch, name: str, count: int) -> list:
+    """Makes FileProcessor.name raise Interrupted on call count + 1; returns the list of calls made."""
+    real = REAL[name]
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        if len(calls) > count:
+            raise Interrupted()
+        return real(*args, **kwargs)
+    monkeypatch.setattr(FileProcessor, name, staticmethod(wrapper))
+    return calls
+
+def count_calls(monkeypatch, name: str) -> list:
+    return fail_after(monkeypatch, name, float("inf"))
+
+def test_resumed_split_keeps_the_chunks_already_written(tmp_path, make_file, chunk_paths, monkeypatch):
+    path = make_file("Hero.uasset", 6 * CHUNK)
+    fail_after(monkeypatch, "_write_chunk", 3)
+    with pytest.raises(Interrupted):
+        FileProcessor.split_file(path, CHUNK)
+    assert os.path.exists(path + JOURNAL_SUFFIX)
+
+    calls = count_calls(monkeypatch, "_write_chunk")
+    assert FileProcessor.split_file(path, CHUNK, resume=True) == 6
+    assert len(calls) == 3
+    assert not os.path.exists(path + JOURNAL_SUFFIX)
+    assert FileProcessor.verify_chunks(path + ".manifest.json", 1) == []
+
+def test_journal_of_a_different_file_is_not_reused(tmp_path, make_file, monkeypatch):
+    path = make_file("Hero.uasset", 6 * CHUNK)
+    fail_after(monkeypatch, "_write_chunk", 3)
+    with pytest.raises(Interrupted):
+        FileProcessor.split_file(path, CHUNK)
+
+    make_file("Hero.uasset", 6 * CHUNK, seed=2)
+    calls = count_calls(monkeypatch, "_write_chunk")
+    FileProcessor.split_file(path, CHUNK, resume=True)
+    assert len(calls) == 6
+    assert FileProcessor.verify_chunks(path + ".manifest.json", 1) == []
+
+def test_resumed_merge_keeps_the_chunks_already_merged(tmp_path, make_file, chunk_paths, monkeypatch):
+    path = make_file("Hero.uasset", 6 * CHUNK + 10)
+    FileProcessor.split_file(path, CHUNK, output_dir=str(tmp_path / "chunks"))
+    parts = chunk_paths(tmp_path / "chunks", "Hero")
+    output_path = str(tmp_path / "merged" / "Hero.uasset")
+    fail_after(monkeypatch, "_merge_chunk", 4)
+    with pytest.raises(Interrupted):
+        FileProcessor.merge_files(output_path, parts)
+    assert os.path.exists(output_path + JOURNAL_SUFFIX)
+
+    calls = count_calls(monkeypatch, "_merge_chunk")
+    FileProcessor.merge_files(output_path, parts, resume=True)
+    assert len(calls) == 3
+    with open(path, "rb") as original, open(output_path, "rb") as merged:
+        assert original.read() == merged.read()
+    assert not os.path.exists(output_path + JOURNAL_SUFFIX)
+
+def test_resume_rewrites_a_merged_chunk_that_was_damaged(tmp_path, make_file, chunk_paths, monkeypatch):
+    path = make_file("Hero.uasset", 4 * CHUNK)
+    FileProcessor.split_file(path, CHUNK, output_dir=str(tmp_path / "chunks"))
+    parts = chunk_paths(tmp_path / "chunks", "Hero")
+    output_path = str(tmp_path / "Hero.uasset")
+    fail_after(monkeypatch, "_merge_chunk", 2)
+    with pytest.raises(Interrupted):
+        FileProcessor.merge_files(output_path, parts)
+    # The merge writes to a temporary name; damage the first chunk it completed there
+    with open(output_path + ".tmp", "r+b") as f:
+        f.write(b"\xff" * 16)
+
+    calls = count_calls(monkeypatch, "_merge_chunk")
+    FileProcessor.merge_files(output_path, parts, resume=True)
+    assert len(calls) == 3
+    with open(path, "rb") as original, open(output_path, "rb") as merged:
+        assert original.read() == merged.read()
@@ -0,0 +1,77 @@
+import io
+import json
+import os
+
+import pytest
+
+from chunkify import streaming
+from chunkify.core import FileProcessor, SPARSE_BLOCK, data_ranges
+
+CHUNK = 4 * SPARSE_BLOCK
+
+@pytest.fixture
+def sparse_file(tmp_path):
+    """A file of data, a hole, data with a run of written zero blocks inside, and a trailing hole."""
+    path = str(tmp_path / "Level.umap")
+    with open(path, "wb") as f:
+        f.write(os.urandom(SPARSE_BLOCK))
+        f.seek(3 * SPARSE_BLOCK)
+        f.write(os.urandom(SPARSE_BLOCK) + bytes(2 * SPARSE_BLOCK) + os.urandom(SPARSE_BLOCK))
+        f.truncate(12 * SPARSE_BLOCK)
+    return path
+
+def holes_supported(path) -> bool:
+    with open(path, "rb") as f:
+        return data_ranges(f.fileno(), 0, os.fstat(f.fileno()).st_size) != [(0, os.fstat(f.fileno()).st_size)]
+
+def read(path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def test_sparse_split_leaves_zero_blocks_out_of_the_chunks(tmp_path, sparse_file, chunk_paths):
+    FileProcessor.split_file(sparse_file, CHUNK, output_dir=str(tmp_path / "chunks"), sparse=True)
+    with open(str(tmp_path / "chunks" / "Level.umap.manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    stored = sum(os.path.getsize(part) for part in chunk_paths(tmp_path / "chunks", "Level"))
+    assert stored == sum(chunk["size"] for chunk in manifest["chunks"])
+    # Only the random blocks are stored; the rest is holes or zero runs either way
+    assert stored == 3 * SPARSE_BLOCK
+    assert all(chunk.get("raw_size", chunk["size"]) == CHUNK for chunk in manifest["chunks"])
+    assert FileProcessor.verify_chunks(str(tmp_path / "chunks" / "Level.umap.manifest.json"), 1) == []
+
+def test_sparse_merge_restores_the_bytes_and_the_holes(tmp_path, sparse_file, chunk_paths):
+    FileProcessor.split_file(sparse_file, CHUNK, output_dir=str(tmp_path / "chunks"), sparse=True)
+    output_path = str(tmp_path / "merged" / "Level.umap")
+    FileProcessor.merge_files(output_path, chunk_paths(tmp_path / "chunks", "Level"), workers=2)
+    assert read(output_path) == read(sparse_file)
+    # Where the filesystem keeps holes, the merged file must keep them too
+    if holes_supported(sparse_file):
+        assert os.stat(output_path).st_blocks * 512 < os.path.getsize(output_path)
+
+def test_sparse_chunks_stream_back_out(tmp_path, sparse_file, chunk_paths):
+    FileProcessor.split_file(sparse_file, CHUNK, output_dir=str(tmp_path / "chunks"), sparse=True)
+    stream = io.BytesIO()
+    streaming.merge_to_stream(chunk_paths(tmp_path / "chunks", "Level"), stream)
+    assert stream.getvalue() == read(sparse_file)
+
+def test_resumed_sparse_merge_keeps_the_chunks_already_merged(tmp_path, sparse_file, chunk_paths, monkeypatch):
+    FileProcessor.split_file(sparse_file, CHUNK, output_dir=str(tmp_path / "chunks"), sparse=True)
+    parts = chunk_paths(tmp_path / "chunks", "Level")
+    output_path = str(tmp_path / "Level.umap")
+    real = FileProcessor._merge_chunk
+    calls = []
+
+    def merge_chunk(*args, **kwargs):
+        calls.append(args[0])
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return real(*args, **kwargs)
+    monkeypatch.setattr(FileProcessor, "_merge_chunk", staticmethod(merge_chunk))
+    with pytest.raises(KeyboardInterrupt):
+        FileProcessor.merge_files(output_path, parts)
+
+    calls.clear()
+    monkeypatch.setattr(FileProcessor, "_merge_chunk", staticmethod(lambda *args: calls.append(args[0]) or real(*args)))
+    FileProcessor.merge_files(output_path, parts, resume=True)
+    assert len(calls) == len(parts) - 2
+    assert read(output_path) == read(sparse_file)
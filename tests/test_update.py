@@ -0,0 +1,64 @@
+import os
+
+from chunkify.core import FileProcessor
+
+CHUNK = 64 * 1024
+
+def written_chunks(monkeypatch) -> list:
+    """Records the chunk path of every _write_chunk call from here on."""
+    real = FileProcessor._write_chunk
+    written = []
+
+    def wrapper(file_path, chunk_path, *args, **kwargs):
+        written.append(os.path.basename(chunk_path))
+        return real(file_path, chunk_path, *args, **kwargs)
+    monkeypatch.setattr(FileProcessor, "_write_chunk", staticmethod(wrapper))
+    return written
+
+def assert_round_trip(path, parts, tmp_path):
+    assert FileProcessor.verify_chunks(path + ".manifest.json", 1) == []
+    output_path = str(tmp_path / "merged.uasset")
+    FileProcessor.merge_files(output_path, parts)
+    with open(path, "rb") as original, open(output_path, "rb") as merged:
+        assert original.read() == merged.read()
+
+def test_update_rewrites_only_the_changed_chunk(tmp_path, make_file, chunk_paths, monkeypatch):
+    path = make_file("Hero.uasset", 4 * CHUNK)
+    FileProcessor.split_file(path, CHUNK)
+    parts = chunk_paths(tmp_path, "Hero")
+    # Back-date the chunks so an untouched file is easy to tell from a rewritten one
+    for part in parts:
+        os.utime(part, (1_000_000, 1_000_000))
+    with open(path, "r+b") as f:
+        f.seek(2 * CHUNK + 5)
+        f.write(b"edited")
+
+    written = written_chunks(monkeypatch)
+    assert FileProcessor.split_file(path, CHUNK, update=True) == 4
+    assert written == ["Hero_part002.uasset"]
+    assert [os.path.getmtime(part) == 1_000_000 for part in parts] == [True, True, False, True]
+    assert_round_trip(path, parts, tmp_path)
+
+def test_update_after_the_file_grew(tmp_path, make_file, chunk_paths, monkeypatch):
+    path = make_file("Hero.uasset", 2 * CHUNK + 100)
+    FileProcessor.split_file(path, CHUNK)
+    with open(path, "ab") as f:
+        f.write(os.urandom(2 * CHUNK))
+
+    written = written_chunks(monkeypatch)
+    assert FileProcessor.split_file(path, CHUNK, update=True) == 5
+    assert written == ["Hero_part002.uasset", "Hero_part003.uasset", "Hero_part004.uasset"]
+    assert_round_trip(path, chunk_paths(tmp_path, "Hero"), tmp_path)
+
+def test_update_after_the_file_shrank_removes_the_parts_past_its_end(tmp_path, make_file, chunk_paths, monkeypatch):
+    path = make_file("Hero.uasset", 5 * CHUNK)
+    FileProcessor.split_file(path, CHUNK)
+    with open(path, "r+b") as f:
+        f.truncate(2 * CHUNK + 10)
+
+    written = written_chunks(monkeypatch)
+    assert FileProcessor.split_file(path, CHUNK, update=True) == 3
+    assert written == ["Hero_part002.uasset"]
+    parts = chunk_paths(tmp_path, "Hero")
+    assert [os.path.basename(part) for part in parts] == [f"Hero_part{index:03d}.uasset" for index in range(3)]
+    assert_round_trip(path, parts, tmp_path)